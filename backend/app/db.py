@@ -1,36 +1,241 @@
 from __future__ import annotations
 
+import hashlib
 import os
+import queue
 import sqlite3
+import threading
+from contextlib import contextmanager
 from pathlib import Path
+from typing import Iterator, Optional, Sequence
 
 BASE_DIR = Path(__file__).resolve().parents[1]
 DATA_DIR = BASE_DIR / "data"
 DATA_DIR.mkdir(parents=True, exist_ok=True)
 DB_PATH = Path(os.getenv("RSS_DB_PATH", DATA_DIR / "rss_reader.db"))
 SCHEMA_PATH = BASE_DIR / "schema.sql"
+# Stored in PRAGMA user_version; bump whenever schema.sql or the migrations in init_db change.
+SCHEMA_VERSION = 7
+# The first version stamped into user_version; items_fts and item_tab_matches already existed
+# by then, so only files below it need their titles indexed and matched.
+INDEX_BACKFILL_VERSION = 2
 
+POOL_SIZE = 8
+# How long acquire waits for a connection once all POOL_SIZE are checked out.
+POOL_ACQUIRE_TIMEOUT_SEC = 10
+IGNORE_BLOCKED_UNREAD_ITEMS_SQL = (
+    "UPDATE items SET status = 'ignored' "
+    "WHERE status = 'unread' "
+    "AND (:source_id IS NULL OR source_id = :source_id) "
+    "AND (:creator_name IS NULL OR creator_name = :creator_name) "
+    "AND EXISTS ("
+    "SELECT 1 FROM author_rules ar "
+    "WHERE ar.rule_type = 'block' "
+    "AND ar.source_id = items.source_id "
+    "AND ar.creator_name = items.creator_name"
+    ")"
+)
+# Pooled connections outlive requests, so the per-connection statement cache skips re-parsing fixed SQL.
+STATEMENT_CACHE_SIZE = 256
 
-def get_connection() -> sqlite3.Connection:
-    conn = sqlite3.connect(DB_PATH)
-    conn.row_factory = sqlite3.Row
-    conn.execute("PRAGMA busy_timeout = 3000")
-    conn.execute("PRAGMA foreign_keys = ON")
-    return conn
+
+class ConnectionPool:
+    def __init__(self, db_path: Path, size: int = POOL_SIZE) -> None:
+        self.db_path = db_path
+        self.size = size
+        self._idle: queue.LifoQueue[sqlite3.Connection] = queue.LifoQueue(maxsize=size)
+        self._created = 0
+        self._lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(
+            self.db_path,
+            check_same_thread=False,
+            isolation_level=None,
+            cached_statements=STATEMENT_CACHE_SIZE,
+        )
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA busy_timeout = 5000")
+        conn.execute("PRAGMA foreign_keys = ON")
+        conn.execute("PRAGMA synchronous = NORMAL")
+        conn.execute("PRAGMA temp_store = MEMORY")
+        conn.execute("PRAGMA cache_size = -64000")
+        conn.execute("PRAGMA mmap_size = 268435456")
+        return conn
+
+    def acquire(self) -> sqlite3.Connection:
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+        with self._lock:
+            can_create = self._created < self.size
+            if can_create:
+                self._created += 1
+        if not can_create:
+            try:
+                return self._idle.get(timeout=POOL_ACQUIRE_TIMEOUT_SEC)
+            except queue.Empty:
+                raise TimeoutError(
+                    f"no SQLite connection became free within {POOL_ACQUIRE_TIMEOUT_SEC}s"
+                ) from None
+        try:
+            return self._connect()
+        except Exception:
+            with self._lock:
+                self._created -= 1
+            raise
+
+    def release(self, conn: sqlite3.Connection) -> None:
+        try:
+            if conn.in_transaction:
+                conn.rollback()
+        except sqlite3.Error:
+            conn.close()
+            with self._lock:
+                self._created -= 1
+            return
+        self._idle.put_nowait(conn)
+
+
+_pool = ConnectionPool(DB_PATH)
+
+
+@contextmanager
+def get_connection() -> Iterator[sqlite3.Connection]:
+    conn = _pool.acquire()
+    try:
+        yield conn
+    finally:
+        _pool.release(conn)
+
+
+@contextmanager
+def write_transaction(conn: sqlite3.Connection) -> Iterator[sqlite3.Connection]:
+    # BEGIN IMMEDIATE takes the write lock up front, so concurrent writers wait on
+    # busy_timeout instead of failing with SQLITE_BUSY when upgrading a read lock.
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        yield conn
+    except BaseException:
+        conn.rollback()
+        raise
+    conn.execute("COMMIT")
 
 
 def init_db() -> None:
     if not SCHEMA_PATH.exists():
         raise FileNotFoundError(f"schema file not found: {SCHEMA_PATH}")
-    schema = SCHEMA_PATH.read_text(encoding="utf-8")
     with get_connection() as conn:
-        conn.executescript(schema)
-        ensure_item_metrics_columns(conn)
-        conn.commit()
+        # journal_mode is persisted in the database file, so setting it once at startup covers
+        # every pooled connection; it runs before the version gate so copied-in files get it too.
+        conn.execute("PRAGMA journal_mode = WAL")
+        if conn.execute("PRAGMA user_version").fetchone()[0] >= SCHEMA_VERSION:
+            return
+        schema = SCHEMA_PATH.read_text(encoding="utf-8")
+        # The whole upgrade, version bump included, commits or rolls back as one unit, so an
+        # interrupted start leaves the old version in place and the next start redoes it all.
+        # The write lock also keeps the API and a cron fetch from migrating side by side; the
+        # version is read again under it in case the other one just finished.
+        with write_transaction(conn):
+            version = conn.execute("PRAGMA user_version").fetchone()[0]
+            if version >= SCHEMA_VERSION:
+                return
+            if table_exists(conn, "items"):
+                # schema.sql indexes published_sort and metrics_status, so older items tables
+                # need those columns before it runs.
+                ensure_item_published_sort_column(conn)
+                ensure_item_metrics_columns(conn)
+                rehash_item_fingerprints(conn)
+            # executescript would commit the open transaction first, so the statements are
+            # run one by one instead.
+            for statement in script_statements(schema):
+                conn.execute(statement)
+            if version < INDEX_BACKFILL_VERSION:
+                # items_fts is an external-content table and item_tab_matches is kept by
+                # triggers; fill both for the titles that predate them.
+                conn.execute("INSERT INTO items_fts(items_fts) VALUES ('rebuild')")
+                conn.execute(
+                    "INSERT OR IGNORE INTO item_tab_matches (item_id, keyword_rule_id) "
+                    "SELECT i.id, kr.id FROM items i JOIN keyword_rules kr "
+                    "ON kr.rule_type = 'tab' AND instr(lower(i.title), lower(kr.keyword)) > 0"
+                )
+            conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        # Give the planner real statistics for the new indexes instead of its defaults.
+        conn.execute("ANALYZE")
+
+
+def script_statements(script: str) -> Iterator[str]:
+    # sqlite3.complete_statement knows that the semicolons inside a trigger body do not end it.
+    statement = ""
+    for line in script.splitlines(keepends=True):
+        statement += line
+        if sqlite3.complete_statement(statement):
+            yield statement
+            statement = ""
+
+
+def table_exists(conn: sqlite3.Connection, name: str) -> bool:
+    row = conn.execute("SELECT 1 FROM sqlite_master WHERE name = ?", (name,)).fetchone()
+    return row is not None
+
+
+def ignore_blocked_unread_items(
+    conn: sqlite3.Connection, source_id: Optional[int] = None, creator_name: Optional[str] = None
+) -> int:
+    # Block rules are applied when they are written (and swept after each fetch) so that
+    # listing unread items stays read-only.
+    params = {"source_id": source_id, "creator_name": creator_name}
+    return conn.execute(IGNORE_BLOCKED_UNREAD_ITEMS_SQL, params).rowcount
+
+
+def rows_to_dicts(cursor: sqlite3.Cursor, columns: Optional[Sequence[str]] = None) -> list[dict]:
+    if columns is None:
+        columns = [column[0] for column in cursor.description]
+    # Rows are zipped into dicts anyway, so skip wrapping each one in sqlite3.Row first; the
+    # cursor-level factory only affects rows not yet fetched. Local aliases keep the per-row
+    # lookups off the globals/builtins dicts.
+    cursor.row_factory = None
+    dict_, zip_ = dict, zip
+    return [dict_(zip_(columns, row)) for row in cursor]
+
+
+def ensure_item_published_sort_column(conn: sqlite3.Connection) -> None:
+    # table_info omits generated columns; table_xinfo lists them.
+    columns = {row["name"] for row in conn.execute("PRAGMA table_xinfo(items)").fetchall()}
+    if "published_sort" not in columns:
+        conn.execute(
+            "ALTER TABLE items ADD COLUMN published_sort TEXT "
+            "GENERATED ALWAYS AS (COALESCE(published_at, published_date, '')) VIRTUAL"
+        )
+
+
+def normalize_link(link: str) -> str:
+    normalized = link.strip()
+    if normalized.endswith("/"):
+        normalized = normalized.rstrip("/")
+    return normalized
+
+
+def fingerprint_for_link(link: str) -> str:
+    # Only a dedupe key, so a 128-bit BLAKE2b digest is plenty and keeps the UNIQUE index
+    # half the width of the SHA-256 hex it replaces.
+    normalized = normalize_link(link)
+    return hashlib.blake2b(normalized.encode("utf-8"), digest_size=16).hexdigest()
 
 
-def rows_to_dicts(rows: list[sqlite3.Row]) -> list[dict]:
-    return [dict(row) for row in rows]
+def rehash_item_fingerprints(conn: sqlite3.Connection) -> None:
+    # Rows stored before the switch still carry 64-character SHA-256 fingerprints.
+    rows = conn.execute("SELECT id, link FROM items WHERE length(fingerprint) = 64").fetchall()
+    if not rows:
+        return
+    # Re-keying is not a content change; drop the updated_at trigger so it does not restamp
+    # every row (which would postpone cleanup of ignored items). schema.sql recreates it.
+    conn.execute("DROP TRIGGER IF EXISTS trg_items_updated_at")
+    conn.executemany(
+        "UPDATE items SET fingerprint = ? WHERE id = ?",
+        [(fingerprint_for_link(row["link"]), row["id"]) for row in rows],
+    )
 
 
 def ensure_item_metrics_columns(conn: sqlite3.Connection) -> None:
@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+import threading
+import time
+from email.message import Message
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+REQUEST_TIMEOUT = 30
+
+
+def build_session() -> requests.Session:
+    # One keep-alive pool per host, so repeated note.com / feed requests skip the TCP+TLS
+    # handshake. Only transient gateway errors and connection failures are retried.
+    retry = Retry(
+        total=2,
+        backoff_factor=0.5,
+        status_forcelist=(502, 503, 504),
+        allowed_methods=frozenset({"GET"}),
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(pool_connections=16, pool_maxsize=16, max_retries=retry)
+    session = requests.Session()
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    session.headers["Accept-Encoding"] = "gzip, deflate"
+    return session
+
+
+SESSION = build_session()
+
+
+def fetch_bytes(url: str, user_agent: str) -> bytes:
+    # Raw body for HTML: selectolax works out the encoding itself (meta charset) and tolerates
+    # stray bytes, so there is no separate decode pass over the document here.
+    response = SESSION.get(url, headers={"User-Agent": user_agent}, timeout=REQUEST_TIMEOUT)
+    response.raise_for_status()
+    return response.content
+
+
+def fetch_text(url: str, user_agent: str) -> str:
+    # Feeds are decoded here instead: expat rejects a whole document over one invalid byte and
+    # cannot read multi-byte legacy encodings such as Shift_JIS or EUC-JP at all.
+    response = SESSION.get(url, headers={"User-Agent": user_agent}, timeout=REQUEST_TIMEOUT)
+    response.raise_for_status()
+    return decode_body(response.content, response.headers.get("Content-Type"))
+
+
+def decode_body(content: bytes, content_type: str | None) -> str:
+    # Only the charset the server declares counts; requests' own guess would read any text/*
+    # response without one as ISO-8859-1.
+    message = Message()
+    message["Content-Type"] = content_type or ""
+    charset = message.get_content_charset() or "utf-8"
+    try:
+        return content.decode(charset, errors="replace")
+    except LookupError:
+        return content.decode("utf-8", errors="replace")
+
+
+# Spaces calls out across threads so at most one starts per interval; used to stay polite to
+# a single host while several workers fetch from it.
+class RateLimiter:
+    def __init__(self, interval_sec: float) -> None:
+        self.interval_sec = interval_sec
+        self._lock = threading.Lock()
+        self._next_at = 0.0
+
+    def wait(self) -> None:
+        with self._lock:
+            now = time.monotonic()
+            start_at = max(now, self._next_at)
+            self._next_at = start_at + self.interval_sec
+        if start_at > now:
+            time.sleep(start_at - now)
\ No newline at end of file
@@ -1,30 +1,256 @@
 from __future__ import annotations
 
-from datetime import datetime
+import asyncio
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timezone
+import json
 import logging
-from typing import Literal, Optional
+import sqlite3
+import threading
+import time
+from typing import Callable, Hashable, Literal, Optional, TypeVar
 
+from cachetools import TTLCache
 from fastapi import FastAPI, HTTPException, Query
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel, HttpUrl
-
-from .db import get_connection, init_db, rows_to_dicts
-from .metrics import process_item_metrics, should_auto_block_item
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel, Field, field_validator
+
+from .db import POOL_SIZE, get_connection, ignore_blocked_unread_items, init_db, rows_to_dicts, write_transaction
+from .metrics import (
+    NOTE_METRICS_WORKERS,
+    collect_item_metrics,
+    mark_item_metrics_failed,
+    should_auto_block_item,
+    store_item_metrics,
+)
 
 SourceType = Literal["search", "tag", "user", "magazine"]
 ItemStatus = Literal["unread", "saved", "ignored"]
 RuleTypeAuthor = Literal["block", "allow", "boost"]
 RuleTypeKeyword = Literal["mute", "boost", "tab"]
 
+FTS_TRIGRAM_MIN_LENGTH = 3
+# A one-character title search matches most titles, so it is ignored rather than scanned for.
+TITLE_SEARCH_MIN_LENGTH = 2
+ORPHAN_TAG_SWEEP_INTERVAL_SEC = 300
+
+T = TypeVar("T")
+
+# published_sort is a generated column that puts items without either date at '' (first
+# ascending, last descending), so keyset cursors can always compare it; see idx_items_status_*pub.
+PUBLISHED_SORT_SQL = "i.published_sort"
+
+ITEM_LIST_COLUMNS = (
+    "id", "source_id", "title", "link", "creator_name",
+    "published_at", "published_date", "status", "metrics_status",
+    "metrics_fetched_at", "has_purechase_cta", "total_character_count",
+    "h2_count", "h3_count", "img_count", "link_count", "p_count",
+    "br_in_p_count", "period_count", "fetched_at",
+)
+ITEM_LIST_SELECT_SQL = f"SELECT {', '.join(f'i.{column}' for column in ITEM_LIST_COLUMNS)} FROM items i "
+# List filters are static SQL with NULL-guarded named parameters so every filter combination
+# shares one statement text (and one cached prepared statement); unused filters bind None.
+# Predicates run in the order written: column equalities first, then keyed EXISTS probes,
+# then title matching and date ranges, which are the most expensive per row.
+TITLE_SEARCH_SQL = (
+    "AND (:fts_query IS NULL OR i.id IN (SELECT rowid FROM items_fts WHERE items_fts MATCH :fts_query)) "
+    "AND (:title_like IS NULL OR i.title LIKE :title_like ESCAPE '\\')"
+)
+UNREAD_ITEMS_WHERE_SQL = (
+    "WHERE i.status = 'unread' "
+    "AND (:source_id IS NULL OR i.source_id = :source_id) "
+    "AND (:keyword_id IS NULL OR EXISTS (SELECT 1 FROM item_tab_matches km "
+    "WHERE km.item_id = i.id AND km.keyword_rule_id = :keyword_id)) "
+    "AND (:other_tab IS NULL OR NOT EXISTS (SELECT 1 FROM item_tab_matches m WHERE m.item_id = i.id)) "
+    "AND (:keyword_fts IS NULL OR i.id IN (SELECT rowid FROM items_fts WHERE items_fts MATCH :keyword_fts)) "
+    "AND (:keyword_like IS NULL OR i.title LIKE :keyword_like ESCAPE '\\') "
+    f"{TITLE_SEARCH_SQL}"
+)
+SAVED_ITEMS_WHERE_SQL = (
+    "WHERE i.status IN ('saved','ignored') "
+    "AND (:source_id IS NULL OR i.source_id = :source_id) "
+    "AND (:status IS NULL OR i.status = :status) "
+    "AND (:tag IS NULL OR EXISTS (SELECT 1 FROM item_tags it JOIN tags t ON t.id = it.tag_id "
+    "WHERE it.item_id = i.id AND t.name = :tag)) "
+    f"{TITLE_SEARCH_SQL} "
+    # date_from/date_to are UTC days: date() normalizes each item's timestamp to UTC. The
+    # published_sort range is only a coarse prefilter that lets the scan seek the index; a
+    # local timestamp's day is at most one day off its UTC day, hence the extra day on each
+    # side. Open bounds fold to constants instead of NULL guards so the seek still applies.
+    "AND i.published_sort >= COALESCE(date(:date_from, '-1 day'), '') "
+    "AND i.published_sort < COALESCE(date(:date_to, '+2 days'), '9999-12-31') "
+    "AND (:date_from IS NULL OR date(i.published_sort) >= date(:date_from)) "
+    "AND (:date_to IS NULL OR date(i.published_sort) <= date(:date_to))"
+)
+UNREAD_ITEMS_COUNT_SQL = f"SELECT COUNT(*) FROM items i {UNREAD_ITEMS_WHERE_SQL}"
+SAVED_ITEMS_COUNT_SQL = f"SELECT COUNT(*) FROM items i {SAVED_ITEMS_WHERE_SQL}"
+# Sort key, direction and "comes after" operator per sort option; unknown values fall back
+# to published_desc.
+ITEM_SORTS = {
+    "published_desc": (PUBLISHED_SORT_SQL, "DESC", "<"),
+    "published_asc": (PUBLISHED_SORT_SQL, "ASC", ">"),
+    "fetched_desc": ("i.fetched_at", "DESC", "<"),
+    "fetched_asc": ("i.fetched_at", "ASC", ">"),
+}
+ITEM_ORDER_SQL = {
+    sort: f" ORDER BY {column} {direction}, i.id {direction} LIMIT :limit OFFSET :offset"
+    for sort, (column, direction, _) in ITEM_SORTS.items()
+}
+# Keyset cursor: resume strictly after the last row sent in (sort key, id) order. The scalar
+# bound lets SQLite seek the sort index; the row-value comparison breaks ties on id.
+ITEM_CURSOR_SQL = {
+    sort: f" AND {column} {op}= :cursor_key AND ({column}, i.id) {op} (:cursor_key, :cursor_id)"
+    for sort, (column, _, op) in ITEM_SORTS.items()
+}
+# Full list statements keyed by (sort, keyset?), assembled once so a request only looks one up.
+UNREAD_ITEMS_LIST_SQL = {
+    (sort, keyset): f"{ITEM_LIST_SELECT_SQL}{UNREAD_ITEMS_WHERE_SQL}"
+    f"{ITEM_CURSOR_SQL[sort] if keyset else ''}{ITEM_ORDER_SQL[sort]}"
+    for sort in ITEM_SORTS
+    for keyset in (False, True)
+}
+SAVED_ITEMS_LIST_SQL = {
+    (sort, keyset): f"{ITEM_LIST_SELECT_SQL}{SAVED_ITEMS_WHERE_SQL}"
+    f"{ITEM_CURSOR_SQL[sort] if keyset else ''}{ITEM_ORDER_SQL[sort]}"
+    for sort in ITEM_SORTS
+    for keyset in (False, True)
+}
+AUTHOR_RULES_LIST_SQL = (
+    "SELECT ar.id, ar.source_id, s.site_name, ar.creator_name, ar.rule_type, ar.memo, "
+    "ar.created_at FROM author_rules ar JOIN sources s ON s.id = ar.source_id "
+    "WHERE (:source_id IS NULL OR ar.source_id = :source_id) "
+    "AND (:rule_type IS NULL OR ar.rule_type = :rule_type) "
+    "AND (:creator_like IS NULL OR ar.creator_name LIKE :creator_like ESCAPE '\\') "
+    "ORDER BY ar.created_at DESC"
+)
+# One row per tab keyword, each carrying the overall totals; with no tab keywords a single
+# row with NULL keyword columns still returns the totals.
+UNREAD_TABS_SQL = (
+    "WITH totals AS ("
+    "SELECT COUNT(*) AS all_count, COUNT(*) FILTER ("
+    "WHERE NOT EXISTS (SELECT 1 FROM item_tab_matches m WHERE m.item_id = i.id)"
+    ") AS other_count FROM items i WHERE i.status = 'unread'"
+    "), keyword_tabs AS ("
+    "SELECT kr.id, kr.keyword, COUNT(i.id) AS count "
+    "FROM keyword_rules kr "
+    "LEFT JOIN item_tab_matches m ON m.keyword_rule_id = kr.id "
+    "LEFT JOIN items i ON i.id = m.item_id AND i.status = 'unread' "
+    "WHERE kr.rule_type = 'tab' "
+    "GROUP BY kr.id, kr.keyword"
+    ") "
+    "SELECT t.all_count, t.other_count, k.id, k.keyword, k.count "
+    "FROM totals t LEFT JOIN keyword_tabs k ORDER BY k.id"
+)
+SAVE_ITEM_SQL = (
+    "UPDATE items SET status = 'saved' WHERE id = ? "
+    "RETURNING id, source_id, "
+    "(SELECT site_name FROM sources WHERE sources.id = items.source_id) AS site_name, "
+    "title, link, creator_name, published_at, published_date, status, metrics_status, "
+    "metrics_fetched_at, has_purechase_cta, total_character_count, "
+    "h2_count, h3_count, img_count, link_count, p_count, "
+    "br_in_p_count, period_count"
+)
+TAG_SEPARATOR = "\x1f"
+# Tag names are bound as one JSON array so the statement text does not vary with tag count.
+INSERT_TAGS_SQL = "INSERT OR IGNORE INTO tags (name) SELECT value FROM json_each(?)"
+LINK_ITEM_TAGS_SQL = (
+    "INSERT OR IGNORE INTO item_tags (item_id, tag_id) "
+    "SELECT ?, id FROM tags WHERE name IN (SELECT value FROM json_each(?))"
+)
+TAGS_LIST_SQL = (
+    "SELECT t.name, COUNT(it.item_id) as count "
+    "FROM tags t LEFT JOIN item_tags it ON it.tag_id = t.id "
+    "WHERE (:name_like IS NULL OR t.name LIKE :name_like ESCAPE '\\') "
+    "GROUP BY t.id ORDER BY count DESC"
+)
+DELETE_ORPHAN_TAGS_SQL = (
+    "DELETE FROM tags WHERE NOT EXISTS (SELECT 1 FROM item_tags it WHERE it.tag_id = tags.id)"
+)
+# One fixed-text statement for a whole page of items; ids are bound as a JSON array.
+ITEM_TAGS_SQL = (
+    "SELECT it.item_id, t.name FROM item_tags it JOIN tags t ON t.id = it.tag_id "
+    "WHERE it.item_id IN (SELECT value FROM json_each(?)) ORDER BY it.item_id, t.name"
+)
+# Spelled out rather than i.* so internal columns such as published_sort stay out of the API.
+ITEM_DETAIL_COLUMNS = (
+    "id", "source_id", "guid", "link", "title", "creator_name", "published_at",
+    "published_date", "fetched_at", "status", "metrics_status", "metrics_fetched_at",
+    "has_purechase_cta", "total_character_count", "h2_count", "h3_count", "img_count",
+    "link_count", "p_count", "br_in_p_count", "period_count", "raw_xml", "fingerprint",
+    "created_at", "updated_at",
+)
+GET_ITEM_SQL = (
+    f"SELECT {', '.join(f'i.{column}' for column in ITEM_DETAIL_COLUMNS)}, s.site_name, "
+    "(SELECT GROUP_CONCAT(t.name, char(31)) FROM tags t JOIN item_tags it ON it.tag_id = t.id "
+    "WHERE it.item_id = i.id) AS tags_blob "
+    "FROM items i JOIN sources s ON s.id = i.source_id WHERE i.id = ?"
+)
+SOURCE_COLUMNS = (
+    "id, site_name, feed_url, source_type, creator_tag, is_enabled, "
+    "fetch_interval_min, last_fetched_at, created_at"
+)
+SOURCES_LIST_SQL = (
+    f"SELECT {SOURCE_COLUMNS} FROM sources "
+    "WHERE (:is_enabled IS NULL OR is_enabled = :is_enabled) "
+    "AND (:source_type IS NULL OR source_type = :source_type) "
+    "ORDER BY created_at DESC"
+)
+INSERT_SOURCE_SQL = (
+    "INSERT INTO sources (site_name, feed_url, source_type, creator_tag, is_enabled, fetch_interval_min) "
+    f"VALUES (?, ?, ?, ?, ?, ?) RETURNING {SOURCE_COLUMNS}"
+)
+UPDATE_SOURCE_SQL = (
+    "UPDATE sources SET site_name = ?, feed_url = ?, source_type = ?, creator_tag = ?, "
+    f"is_enabled = ?, fetch_interval_min = ? WHERE id = ? RETURNING {SOURCE_COLUMNS}"
+)
+AUTHOR_RULE_COLUMNS = "id, source_id, creator_name, rule_type, memo, created_at"
+INSERT_AUTHOR_RULE_SQL = (
+    "INSERT INTO author_rules (source_id, creator_name, rule_type, memo) VALUES (?, ?, ?, ?) "
+    f"RETURNING {AUTHOR_RULE_COLUMNS}"
+)
+UPDATE_AUTHOR_RULE_SQL = (
+    "UPDATE author_rules SET source_id = ?, creator_name = ?, rule_type = ?, memo = ? WHERE id = ? "
+    f"RETURNING {AUTHOR_RULE_COLUMNS}"
+)
+AUTO_BLOCK_AUTHOR_SQL = (
+    "INSERT OR IGNORE INTO author_rules (source_id, creator_name, rule_type) VALUES (?, ?, 'block')"
+)
+METRICS_ITEMS_SQL = (
+    "SELECT id, link, source_id, creator_name FROM items "
+    "WHERE id IN (SELECT value FROM json_each(?))"
+)
+IGNORE_ITEMS_SQL = "UPDATE items SET status = 'ignored' WHERE id IN (SELECT value FROM json_each(?))"
+KEYWORD_RULE_COLUMNS = "id, keyword, rule_type, created_at"
+KEYWORD_RULES_LIST_SQL = (
+    f"SELECT {KEYWORD_RULE_COLUMNS} FROM keyword_rules "
+    "WHERE (:rule_type IS NULL OR rule_type = :rule_type) "
+    "ORDER BY created_at DESC"
+)
+INSERT_KEYWORD_RULE_SQL = (
+    f"INSERT INTO keyword_rules (keyword, rule_type) VALUES (?, ?) RETURNING {KEYWORD_RULE_COLUMNS}"
+)
+UPDATE_KEYWORD_RULE_SQL = (
+    f"UPDATE keyword_rules SET keyword = ?, rule_type = ? WHERE id = ? RETURNING {KEYWORD_RULE_COLUMNS}"
+)
+
 
 class SourceIn(BaseModel):
     site_name: str
-    feed_url: HttpUrl
+    feed_url: str
     source_type: SourceType
     creator_tag: str = "note:creatorName"
     is_enabled: bool = True
     fetch_interval_min: int = 180
 
+    # Only the scheme matters to the fetcher; a full HttpUrl parse (IDNA etc.) is not needed.
+    @field_validator("feed_url")
+    @classmethod
+    def check_feed_url(cls, value: str) -> str:
+        if not value.startswith(("http://", "https://")):
+            raise ValueError("feed_url must start with http:// or https://")
+        return value
+
 
 class SourceOut(SourceIn):
     id: int
@@ -37,7 +263,9 @@ class ItemOut(BaseModel):
     source_id: int
     site_name: str
     title: str
-    link: HttpUrl
+    # Plain str, like SourceIn.feed_url: links are stored from feeds and returned as-is, and
+    # save_item builds this model with model_construct, which needs values of the declared type.
+    link: str
     creator_name: Optional[str] = None
     published_at: Optional[str] = None
     published_date: Optional[str] = None
@@ -71,6 +299,10 @@ class KeywordRuleIn(BaseModel):
     rule_type: RuleTypeKeyword
 
 
+class MetricsBatchIn(BaseModel):
+    item_ids: list[int] = Field(min_length=1, max_length=100)
+
+
 class FetchJobRequest(BaseModel):
     source_ids: Optional[list[int]] = None
 
@@ -81,7 +313,9 @@ class FetchJobStatus(BaseModel):
     last_error: Optional[str]
 
 
-app = FastAPI(title="RSS Reader")
+# List routes return ORJSONResponse themselves: their rows are already JSON-ready, and a
+# returned response skips FastAPI's jsonable_encoder walk over every row.
+app = FastAPI(title="RSS Reader", default_response_class=ORJSONResponse)
 logger = logging.getLogger(__name__)
 
 app.add_middleware(
@@ -92,16 +326,146 @@ app.add_middleware(
     allow_headers=["*"]
 )
 
+# Replaced wholesale, never mutated, so a reader always sees one consistent snapshot.
+job_status_lock = threading.Lock()
 job_status = FetchJobStatus(last_run_at=None, last_run_sources=[], last_error=None)
 
+# SQLite allows one writer at a time, so writes are serialized on a single thread while
+# reads fan out over the rest of the connection pool: the executors alone never want more
+# connections than POOL_SIZE. The pool is shared with the sync metrics routes, which
+# take connections on FastAPI's threadpool, so a read can still wait in db.get_connection;
+# those routes only hold one for short queries, and acquire times out rather than hanging.
+read_executor = ThreadPoolExecutor(max_workers=POOL_SIZE - 1, thread_name_prefix="sqlite-read")
+write_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="sqlite-write")
+# note.com fetch + parse for batch metrics requests; paced by the shared note_rate_limiter.
+metrics_executor = ThreadPoolExecutor(max_workers=NOTE_METRICS_WORKERS, thread_name_prefix="note-metrics")
+
+
+async def run_read(func: Callable[[], T]) -> T:
+    return await asyncio.get_running_loop().run_in_executor(read_executor, func)
+
+
+async def run_write(func: Callable[[], T]) -> T:
+    return await asyncio.get_running_loop().run_in_executor(write_executor, func)
+
+
+# Longest the in-memory caches below serve data written by another process (a second API
+# worker or a fetch script), since only in-process writes invalidate them.
+CACHE_TTL_SEC = 30
+
+# sources is tiny and rarely written, so item lists fill site_name from memory instead of
+# joining it per row. Source writes bump the version after committing; a load that raced
+# with a write is returned but not cached. An item whose source is missing from the cache
+# triggers one reload, so a source added by another worker shows up at once.
+site_name_lock = threading.Lock()
+site_name_version = 0
+site_name_cache: dict[int, str] = {}
+site_name_cache_version = -1
+site_name_cache_loaded_at = 0.0
+
+
+def invalidate_site_names() -> None:
+    global site_name_version
+    with site_name_lock:
+        site_name_version += 1
+
+
+def load_site_names(conn: sqlite3.Connection, refresh: bool = False) -> dict[int, str]:
+    global site_name_cache, site_name_cache_version, site_name_cache_loaded_at
+    now = time.monotonic()
+    with site_name_lock:
+        if (
+            not refresh
+            and site_name_cache_version == site_name_version
+            and now - site_name_cache_loaded_at < CACHE_TTL_SEC
+        ):
+            return site_name_cache
+        version = site_name_version
+    names = dict(conn.execute("SELECT id, site_name FROM sources").fetchall())
+    with site_name_lock:
+        if version == site_name_version:
+            site_name_cache, site_name_cache_version, site_name_cache_loaded_at = names, version, now
+    return names
+
+
+def fill_site_names(conn: sqlite3.Connection, items: list[dict]) -> list[dict]:
+    names = load_site_names(conn)
+    if any(item["source_id"] not in names for item in items):
+        names = load_site_names(conn, refresh=True)
+    for item in items:
+        item["site_name"] = names.get(item["source_id"])
+    return items
+
+
+# Sources and rules are read on nearly every screen but written rarely. Their list responses
+# are cached for a short TTL (which also bounds staleness from the fetch scripts' writes)
+# and cleared by every in-process mutation, using the same version guard as site names.
+list_cache_lock = threading.Lock()
+list_cache_version = 0
+list_cache: TTLCache = TTLCache(maxsize=64, ttl=CACHE_TTL_SEC)
+
+
+def invalidate_list_cache() -> None:
+    global list_cache_version
+    with list_cache_lock:
+        list_cache_version += 1
+        list_cache.clear()
+
+
+async def cached_list(key: Hashable, load: Callable[[], list[dict]]) -> list[dict]:
+    with list_cache_lock:
+        rows = list_cache.get(key)
+        version = list_cache_version
+    if rows is not None:
+        return rows
+    rows = await run_read(load)
+    with list_cache_lock:
+        if version == list_cache_version:
+            list_cache[key] = rows
+    return rows
+
+
+def fill_item_tags(conn: sqlite3.Connection, items: list[dict]) -> list[dict]:
+    tags: dict[int, list[str]] = {item["id"]: [] for item in items}
+    if tags:
+        for item_id, name in conn.execute(ITEM_TAGS_SQL, (json.dumps(list(tags)),)):
+            tags[item_id].append(name)
+    for item in items:
+        item["tags"] = tags[item["id"]]
+    return items
+
 
 @app.on_event("startup")
-def startup() -> None:
+async def startup() -> None:
     init_db()
+    app.state.orphan_tag_sweep = asyncio.create_task(sweep_orphan_tags())
 
 
-@app.get("/items/unread", response_model=dict)
-def list_unread_items(
+@app.on_event("shutdown")
+async def shutdown() -> None:
+    app.state.orphan_tag_sweep.cancel()
+
+
+async def sweep_orphan_tags() -> None:
+    # Retagging leaves unused tags behind; reap them off the request path so list_tags
+    # does not aggregate dead rows.
+    def delete() -> int:
+        with get_connection() as conn, write_transaction(conn):
+            return conn.execute(DELETE_ORPHAN_TAGS_SQL).rowcount
+
+    while True:
+        await asyncio.sleep(ORPHAN_TAG_SWEEP_INTERVAL_SEC)
+        try:
+            deleted = await run_write(delete)
+        except Exception:
+            logger.exception("orphan tag sweep failed")
+            continue
+        if deleted:
+            logger.info("orphan tags deleted: %s", deleted)
+
+
+@app.get("/items/unread", response_model=None)
+async def list_unread_items(
     source_id: Optional[int] = None,
     tab: Optional[str] = Query(default=None, pattern="^(all|other|keyword)?$"),
     keyword_id: Optional[int] = None,
@@ -109,121 +473,55 @@ def list_unread_items(
     q: Optional[str] = None,
     limit: int = 50,
     offset: int = 0,
+    cursor_key: Optional[str] = None,
+    cursor_id: Optional[int] = None,
     sort: str = "published_desc",
-) -> dict:
-    params: list[object] = []
-    where = ["i.status = 'unread'"]
-
-    if source_id is not None:
-        where.append("i.source_id = ?")
-        params.append(source_id)
-
-    if q:
-        where.append("i.title LIKE ?")
-        params.append(f"%{q}%")
-
-    keyword_filter = None
-    if tab == "keyword":
-        if keyword_id is not None:
-            keyword_filter = ("SELECT keyword FROM keyword_rules WHERE id = ?", [keyword_id])
-        elif keyword:
-            keyword_filter = ("SELECT ? as keyword", [keyword])
-        else:
-            raise HTTPException(status_code=400, detail="keyword_id or keyword is required for keyword tab")
-
-    if tab == "other":
-        where.append(
-            "NOT EXISTS (SELECT 1 FROM keyword_rules kr "
-            "WHERE kr.rule_type = 'tab' AND i.title LIKE '%' || kr.keyword || '%')"
-        )
-
-    if keyword_filter:
-        keyword_query, keyword_params = keyword_filter
-        where.append(
-            f"EXISTS (SELECT 1 FROM ({keyword_query}) kw "
-            "WHERE i.title LIKE '%' || kw.keyword || '%')"
-        )
-        params.extend(keyword_params)
-
-    order_by = "COALESCE(i.published_at, i.published_date) DESC"
-    if sort == "published_asc":
-        order_by = "COALESCE(i.published_at, i.published_date) ASC"
-    elif sort == "fetched_desc":
-        order_by = "i.fetched_at DESC"
-    elif sort == "fetched_asc":
-        order_by = "i.fetched_at ASC"
-
-    where_clause = " AND ".join(where)
-    query = (
-        "SELECT i.id, i.source_id, s.site_name, i.title, i.link, i.creator_name, "
-        "i.published_at, i.published_date, i.status, i.metrics_status, "
-        "i.metrics_fetched_at, i.has_purechase_cta, i.total_character_count, "
-        "i.h2_count, i.h3_count, i.img_count, i.link_count, i.p_count, "
-        "i.br_in_p_count, i.period_count "
-        "FROM items i JOIN sources s ON s.id = i.source_id "
-        f"WHERE {where_clause} "
-        f"ORDER BY {order_by}"
-    )
-    count_params = list(params)
-    query += " LIMIT ? OFFSET ?"
-    params.extend([limit, offset])
+) -> ORJSONResponse:
+    if tab == "keyword" and keyword_id is None and not keyword:
+        raise HTTPException(status_code=400, detail="keyword_id or keyword is required for keyword tab")
+    sort = sort if sort in ITEM_SORTS else "published_desc"
+    fts_query, title_like = title_search_params(q, TITLE_SEARCH_MIN_LENGTH)
+    keyword_fts, keyword_like = title_search_params(keyword if tab == "keyword" and keyword_id is None else None)
+    params: dict[str, object] = {
+        "source_id": source_id,
+        "fts_query": fts_query,
+        "title_like": title_like,
+        "keyword_id": keyword_id if tab == "keyword" else None,
+        "keyword_fts": keyword_fts,
+        "keyword_like": keyword_like,
+        "other_tab": 1 if tab == "other" else None,
+    }
+    query = item_list_query(UNREAD_ITEMS_LIST_SQL, params, sort, limit, offset, cursor_key, cursor_id)
 
-    with get_connection() as conn:
-        logger.info("DBクエリ開始: list_unread_items")
-        ignored_params: list[object] = []
-        ignored_where = ["items.status = 'unread'"]
-        if source_id is not None:
-            ignored_where.append("items.source_id = ?")
-            ignored_params.append(source_id)
-        conn.execute(
-            "UPDATE items SET status = 'ignored' "
-            f"WHERE {' AND '.join(ignored_where)} "
-            "AND EXISTS ("
-            "SELECT 1 FROM author_rules ar "
-            "WHERE ar.rule_type = 'block' "
-            "AND ar.source_id = items.source_id "
-            "AND ar.creator_name = items.creator_name"
-            ")",
-            ignored_params,
-        )
-        conn.commit()
-        count_query = f"SELECT COUNT(*) FROM items i WHERE {where_clause}"
-        total = conn.execute(count_query, count_params).fetchone()[0]
-        rows = conn.execute(query, params).fetchall()
-        logger.info("DBクエリ終了: list_unread_items")
-
-    logger.info("JSON化開始: list_unread_items")
-    items = rows_to_dicts(rows)
-    logger.info("JSON化終了: list_unread_items")
-    return {"items": items, "total": total}
-
-
-@app.get("/items/unread/tabs", response_model=dict)
-def unread_tabs() -> dict:
-    with get_connection() as conn:
-        logger.info("DBクエリ開始: unread_tabs")
-        total = conn.execute("SELECT COUNT(*) FROM items WHERE status = 'unread'").fetchone()[0]
-        keyword_tabs = conn.execute(
-            "SELECT kr.id, kr.keyword, "
-            "(SELECT COUNT(*) FROM items i "
-            "WHERE i.status = 'unread' "
-            "AND i.title LIKE '%' || kr.keyword || '%') AS count "
-            "FROM keyword_rules kr WHERE kr.rule_type = 'tab'"
-        ).fetchall()
-        other_count = conn.execute(
-            "SELECT COUNT(*) FROM items i "
-            "WHERE i.status = 'unread' "
-            "AND NOT EXISTS (SELECT 1 FROM keyword_rules kr "
-            "WHERE kr.rule_type = 'tab' AND i.title LIKE '%' || kr.keyword || '%')"
-        ).fetchone()[0]
-        logger.info("DBクエリ終了: unread_tabs")
+    def query_items() -> tuple[int, list[dict]]:
+        with get_connection() as conn:
+            logger.info("DBクエリ開始: list_unread_items")
+            items = fill_site_names(conn, rows_to_dicts(conn.execute(query, params), ITEM_LIST_COLUMNS))
+            total = page_total(conn, UNREAD_ITEMS_COUNT_SQL, params, items, limit, offset, cursor_id)
+            logger.info("DBクエリ終了: list_unread_items")
+        return total, items
+
+    total, items = await run_read(query_items)
+    return ORJSONResponse({"items": items, "total": total, "next_cursor": next_item_cursor(items, limit, sort)})
+
+
+@app.get("/items/unread/tabs", response_model=None)
+async def unread_tabs() -> dict:
+    def query_counts() -> list[sqlite3.Row]:
+        with get_connection() as conn:
+            logger.info("DBクエリ開始: unread_tabs")
+            rows = conn.execute(UNREAD_TABS_SQL).fetchall()
+            logger.info("DBクエリ終了: unread_tabs")
+        return rows
+
+    rows = await run_read(query_counts)
 
     logger.info("JSON化開始: unread_tabs")
     response = {
-        "all_count": total,
-        "other_count": other_count,
+        "all_count": rows[0][0],
+        "other_count": rows[0][1],
         "keyword_tabs": [
-            {"keyword_id": row[0], "keyword": row[1], "count": row[2]} for row in keyword_tabs
+            {"keyword_id": row[2], "keyword": row[3], "count": row[4]} for row in rows if row[2] is not None
         ],
     }
     logger.info("JSON化終了: unread_tabs")
@@ -231,47 +529,45 @@ def unread_tabs() -> dict:
 
 
 @app.post("/items/{item_id}/save", response_model=ItemOut)
-def save_item(item_id: int, payload: TagsIn) -> ItemOut:
-    with get_connection() as conn:
-        conn.execute("UPDATE items SET status = 'saved' WHERE id = ?", (item_id,))
-        update_item_tags(conn, item_id, payload.tags)
-        row = conn.execute(
-            "SELECT i.id, i.source_id, s.site_name, i.title, i.link, i.creator_name, "
-            "i.published_at, i.published_date, i.status, i.metrics_status, "
-            "i.metrics_fetched_at, i.has_purechase_cta, i.total_character_count, "
-            "i.h2_count, i.h3_count, i.img_count, i.link_count, i.p_count, "
-            "i.br_in_p_count, i.period_count "
-            "FROM items i JOIN sources s ON s.id = i.source_id WHERE i.id = ?",
-            (item_id,),
-        ).fetchone()
-        if not row:
-            raise HTTPException(status_code=404, detail="item not found")
-        conn.commit()
-        return ItemOut(**dict(row))
+async def save_item(item_id: int, payload: TagsIn) -> ItemOut:
+    def save() -> sqlite3.Row:
+        with get_connection() as conn, write_transaction(conn):
+            row = conn.execute(SAVE_ITEM_SQL, (item_id,)).fetchone()
+            if not row:
+                raise HTTPException(status_code=404, detail="item not found")
+            update_item_tags(conn, item_id, payload.tags)
+        return row
+
+    row = await run_write(save)
+    return ItemOut.model_construct(**row)
 
 
 @app.post("/items/{item_id}/ignore")
-def ignore_item(item_id: int) -> dict:
-    with get_connection() as conn:
-        cur = conn.execute("UPDATE items SET status = 'ignored' WHERE id = ?", (item_id,))
-        if cur.rowcount == 0:
-            raise HTTPException(status_code=404, detail="item not found")
-        conn.commit()
+async def ignore_item(item_id: int) -> dict:
+    def update_status() -> None:
+        with get_connection() as conn, write_transaction(conn):
+            cur = conn.execute("UPDATE items SET status = 'ignored' WHERE id = ?", (item_id,))
+            if cur.rowcount == 0:
+                raise HTTPException(status_code=404, detail="item not found")
+
+    await run_write(update_status)
     return {"status": "ignored"}
 
 
 @app.post("/items/{item_id}/unsave")
-def unsave_item(item_id: int) -> dict:
-    with get_connection() as conn:
-        cur = conn.execute("UPDATE items SET status = 'saved' WHERE id = ?", (item_id,))
-        if cur.rowcount == 0:
-            raise HTTPException(status_code=404, detail="item not found")
-        conn.commit()
+async def unsave_item(item_id: int) -> dict:
+    def update_status() -> None:
+        with get_connection() as conn, write_transaction(conn):
+            cur = conn.execute("UPDATE items SET status = 'saved' WHERE id = ?", (item_id,))
+            if cur.rowcount == 0:
+                raise HTTPException(status_code=404, detail="item not found")
+
+    await run_write(update_status)
     return {"status": "saved"}
 
 
-@app.get("/items/saved", response_model=dict)
-def list_saved_items(
+@app.get("/items/saved", response_model=None)
+async def list_saved_items(
     source_id: Optional[int] = None,
     status: Optional[str] = None,
     date_from: Optional[str] = None,
@@ -280,437 +576,474 @@ def list_saved_items(
     q: Optional[str] = None,
     limit: int = 50,
     offset: int = 0,
+    cursor_key: Optional[str] = None,
+    cursor_id: Optional[int] = None,
     sort: str = "published_desc",
-) -> dict:
-    params: list[object] = []
-    where = ["i.status IN ('saved','ignored')"]
-
-    if source_id is not None:
-        where.append("i.source_id = ?")
-        params.append(source_id)
-
-    if status:
-        where.append("i.status = ?")
-        params.append(status)
-
-    if q:
-        where.append("i.title LIKE ?")
-        params.append(f"%{q}%")
-
-    if date_from:
-        where.append("date(COALESCE(i.published_at, i.published_date)) >= date(?)")
-        params.append(date_from)
-
-    if date_to:
-        where.append("date(COALESCE(i.published_at, i.published_date)) <= date(?)")
-        params.append(date_to)
-
-    join_tags = ""
-    if tag:
-        join_tags = "JOIN item_tags it ON it.item_id = i.id JOIN tags t ON t.id = it.tag_id"
-        where.append("t.name = ?")
-        params.append(tag)
-
-    order_by = "COALESCE(i.published_at, i.published_date) DESC"
-    if sort == "published_asc":
-        order_by = "COALESCE(i.published_at, i.published_date) ASC"
-    elif sort == "fetched_desc":
-        order_by = "i.fetched_at DESC"
-    elif sort == "fetched_asc":
-        order_by = "i.fetched_at ASC"
-
-    where_clause = " AND ".join(where)
-    query = (
-        "SELECT i.id, i.source_id, s.site_name, i.title, i.link, i.creator_name, "
-        "i.published_at, i.published_date, i.status, i.metrics_status, "
-        "i.metrics_fetched_at, i.has_purechase_cta, i.total_character_count, "
-        "i.h2_count, i.h3_count, i.img_count, i.link_count, i.p_count, "
-        "i.br_in_p_count, i.period_count "
-        "FROM items i JOIN sources s ON s.id = i.source_id "
-        f"{join_tags} "
-        f"WHERE {where_clause} "
-        f"ORDER BY {order_by} LIMIT ? OFFSET ?"
-    )
-    count_query = f"SELECT COUNT(*) FROM items i {join_tags} WHERE {where_clause}"
-    count_params = list(params)
-    params.extend([limit, offset])
-
-    with get_connection() as conn:
-        logger.info("DBクエリ開始: list_saved_items")
-        total = conn.execute(count_query, count_params).fetchone()[0]
-        rows = conn.execute(query, params).fetchall()
-        logger.info("DBクエリ終了: list_saved_items")
-
-    logger.info("JSON化開始: list_saved_items")
-    items = rows_to_dicts(rows)
-    logger.info("JSON化終了: list_saved_items")
-    return {"items": items, "total": total}
-
-
-@app.get("/items/{item_id}")
-def get_item(item_id: int) -> dict:
-    with get_connection() as conn:
-        logger.info("DBクエリ開始: get_item")
-        row = conn.execute(
-            "SELECT i.*, s.site_name FROM items i JOIN sources s ON s.id = i.source_id WHERE i.id = ?",
-            (item_id,),
-        ).fetchone()
-        if not row:
-            raise HTTPException(status_code=404, detail="item not found")
-        tags = conn.execute(
-            "SELECT t.name FROM tags t JOIN item_tags it ON it.tag_id = t.id WHERE it.item_id = ?",
-            (item_id,),
-        ).fetchall()
-        logger.info("DBクエリ終了: get_item")
+) -> ORJSONResponse:
+    sort = sort if sort in ITEM_SORTS else "published_desc"
+    fts_query, title_like = title_search_params(q, TITLE_SEARCH_MIN_LENGTH)
+    params: dict[str, object] = {
+        "source_id": source_id,
+        "status": status or None,
+        "fts_query": fts_query,
+        "title_like": title_like,
+        "date_from": date_from or None,
+        "date_to": date_to or None,
+        "tag": tag or None,
+    }
+    query = item_list_query(SAVED_ITEMS_LIST_SQL, params, sort, limit, offset, cursor_key, cursor_id)
+
+    def query_items() -> tuple[int, list[dict]]:
+        with get_connection() as conn:
+            logger.info("DBクエリ開始: list_saved_items")
+            items = fill_site_names(conn, rows_to_dicts(conn.execute(query, params), ITEM_LIST_COLUMNS))
+            fill_item_tags(conn, items)
+            total = page_total(conn, SAVED_ITEMS_COUNT_SQL, params, items, limit, offset, cursor_id)
+            logger.info("DBクエリ終了: list_saved_items")
+        return total, items
+
+    total, items = await run_read(query_items)
+    return ORJSONResponse({"items": items, "total": total, "next_cursor": next_item_cursor(items, limit, sort)})
+
+
+@app.get("/items/{item_id}", response_model=None)
+async def get_item(item_id: int) -> dict:
+    def query_item() -> sqlite3.Row:
+        with get_connection() as conn:
+            logger.info("DBクエリ開始: get_item")
+            row = conn.execute(GET_ITEM_SQL, (item_id,)).fetchone()
+            if not row:
+                raise HTTPException(status_code=404, detail="item not found")
+            logger.info("DBクエリ終了: get_item")
+        return row
+
+    row = await run_read(query_item)
 
     logger.info("JSON化開始: get_item")
     item = dict(row)
-    item["tags"] = [tag[0] for tag in tags]
+    tags_blob = item.pop("tags_blob")
+    item["tags"] = tags_blob.split(TAG_SEPARATOR) if tags_blob else []
     logger.info("JSON化終了: get_item")
     return item
 
 
+# Kept as a sync route: it waits on note.com for up to REQUEST_TIMEOUT seconds, which
+# belongs on FastAPI's worker threadpool rather than the dedicated SQLite executors. No pooled
+# connection is held during the fetch: the row is read, the connection released, and one is
+# taken again only to write the result.
 @app.post("/items/{item_id}/metrics")
 def fetch_item_metrics(item_id: int) -> dict:
     with get_connection() as conn:
         row = conn.execute(
-            "SELECT id, link FROM items WHERE id = ?",
+            "SELECT id, link, source_id, creator_name FROM items WHERE id = ?",
             (item_id,),
         ).fetchone()
-        if not row:
-            raise HTTPException(status_code=404, detail="item not found")
-        try:
-            metrics = process_item_metrics(conn, row["id"], row["link"])
-        except ValueError as exc:
+    if not row:
+        raise HTTPException(status_code=404, detail="item not found")
+    try:
+        metrics = collect_item_metrics(row["link"])
+    except Exception as exc:
+        with get_connection() as conn:
+            mark_item_metrics_failed(conn, item_id)
+        if isinstance(exc, ValueError):
             raise HTTPException(status_code=400, detail=str(exc))
-        except Exception as exc:
-            logger.exception("failed to fetch metrics item_id=%s", item_id)
-            raise HTTPException(status_code=500, detail="failed to fetch metrics") from exc
-        metrics_row = conn.execute(
-            """
-            SELECT source_id, creator_name, total_character_count, h2_count, h3_count,
-                   p_count, br_in_p_count, period_count
-            FROM items WHERE id = ?
-            """,
-            (item_id,),
-        ).fetchone()
-        if metrics_row and metrics_row["creator_name"] and should_auto_block_item(dict(metrics_row)):
-            try:
-                conn.execute(
-                    """
-                    INSERT INTO author_rules (source_id, creator_name, rule_type)
-                    VALUES (?, ?, 'block')
-                    """,
-                    (metrics_row["source_id"], metrics_row["creator_name"]),
-                )
-            except Exception as exc:
-                if "UNIQUE" not in str(exc):
-                    raise
+        logger.exception("failed to fetch metrics item_id=%s", item_id)
+        raise HTTPException(status_code=500, detail="failed to fetch metrics") from exc
+    # Judged on the metrics just fetched rather than re-reading the row.
+    auto_block = bool(row["creator_name"]) and should_auto_block_item(metrics)
+    with get_connection() as conn, write_transaction(conn):
+        store_item_metrics(conn, item_id, metrics)
+        if auto_block:
+            conn.execute(AUTO_BLOCK_AUTHOR_SQL, (row["source_id"], row["creator_name"]))
             conn.execute("UPDATE items SET status = 'ignored' WHERE id = ?", (item_id,))
-            conn.commit()
+            ignore_blocked_unread_items(conn, row["source_id"], row["creator_name"])
+    if auto_block:
+        invalidate_list_cache()
     return {"status": "done", "metrics": metrics}
 
 
-@app.put("/items/{item_id}/tags")
-def update_tags(item_id: int, payload: TagsIn) -> dict:
+# Sync for the same reason as fetch_item_metrics. Pages are fetched and parsed on
+# metrics_executor with no pooled connection held; once every fetch has finished, the
+# results and the auto-block writes for the whole batch are stored in one transaction.
+@app.post("/items/metrics/batch")
+def fetch_items_metrics(payload: MetricsBatchIn) -> dict:
+    item_ids = list(dict.fromkeys(payload.item_ids))
+    results: dict[int, dict] = {item_id: {"item_id": item_id, "status": "not_found"} for item_id in item_ids}
     with get_connection() as conn:
-        update_item_tags(conn, item_id, payload.tags)
-        conn.commit()
+        rows = conn.execute(METRICS_ITEMS_SQL, (json.dumps(item_ids),)).fetchall()
+    if not rows:
+        return {"results": list(results.values())}
+    collected: list[tuple[sqlite3.Row, Optional[dict[str, int]]]] = []
+    futures = {metrics_executor.submit(collect_item_metrics, row["link"]): row for row in rows}
+    for future in as_completed(futures):
+        row = futures[future]
+        try:
+            metrics = future.result()
+        except ValueError as exc:
+            results[row["id"]] = {"item_id": row["id"], "status": "failed", "detail": str(exc)}
+            collected.append((row, None))
+            continue
+        except Exception:
+            logger.exception("failed to fetch metrics item_id=%s", row["id"])
+            results[row["id"]] = {"item_id": row["id"], "status": "failed", "detail": "failed to fetch metrics"}
+            collected.append((row, None))
+            continue
+        results[row["id"]] = {"item_id": row["id"], "status": "done", "metrics": metrics}
+        collected.append((row, metrics))
+    blocked = [
+        row
+        for row, metrics in collected
+        if metrics is not None and row["creator_name"] and should_auto_block_item(metrics)
+    ]
+    with get_connection() as conn, write_transaction(conn):
+        for row, metrics in collected:
+            if metrics is None:
+                mark_item_metrics_failed(conn, row["id"])
+            else:
+                store_item_metrics(conn, row["id"], metrics)
+        if blocked:
+            authors = list(dict.fromkeys((row["source_id"], row["creator_name"]) for row in blocked))
+            conn.executemany(AUTO_BLOCK_AUTHOR_SQL, authors)
+            conn.execute(IGNORE_ITEMS_SQL, (json.dumps([row["id"] for row in blocked]),))
+            for source_id, creator_name in authors:
+                ignore_blocked_unread_items(conn, source_id, creator_name)
+    if blocked:
+        invalidate_list_cache()
+    return {"results": list(results.values())}
+
+
+@app.put("/items/{item_id}/tags")
+async def update_tags(item_id: int, payload: TagsIn) -> dict:
+    def update() -> None:
+        with get_connection() as conn, write_transaction(conn):
+            update_item_tags(conn, item_id, payload.tags)
+
+    await run_write(update)
     return {"tags": payload.tags}
 
 
-@app.get("/tags")
-def list_tags(q: Optional[str] = None) -> list[dict]:
-    where = ""
-    params: list[object] = []
-    if q:
-        where = "WHERE t.name LIKE ?"
-        params.append(f"%{q}%")
-    query = (
-        "SELECT t.name, COUNT(it.item_id) as count "
-        "FROM tags t LEFT JOIN item_tags it ON it.tag_id = t.id "
-        f"{where} GROUP BY t.id ORDER BY count DESC"
-    )
-    with get_connection() as conn:
-        logger.info("DBクエリ開始: list_tags")
-        rows = conn.execute(query, params).fetchall()
-        logger.info("DBクエリ終了: list_tags")
-    logger.info("JSON化開始: list_tags")
-    result = rows_to_dicts(rows)
-    logger.info("JSON化終了: list_tags")
-    return result
+@app.get("/tags", response_model=None)
+async def list_tags(q: Optional[str] = None) -> ORJSONResponse:
+    params = {"name_like": like_contains(q) if q else None}
+
+    def query_rows() -> list[dict]:
+        with get_connection() as conn:
+            logger.info("DBクエリ開始: list_tags")
+            rows = rows_to_dicts(conn.execute(TAGS_LIST_SQL, params))
+            logger.info("DBクエリ終了: list_tags")
+        return rows
 
+    return ORJSONResponse(await run_read(query_rows))
 
-@app.get("/sources", response_model=list[SourceOut])
-def list_sources(
+
+@app.get("/sources", response_model=None)
+async def list_sources(
     enabled: Optional[bool] = None,
     source_type: Optional[str] = None,
-) -> list[SourceOut]:
-    where = []
-    params: list[object] = []
-    if enabled is not None:
-        where.append("is_enabled = ?")
-        params.append(1 if enabled else 0)
-    if source_type:
-        where.append("source_type = ?")
-        params.append(source_type)
-
-    where_clause = ""
-    if where:
-        where_clause = f"WHERE {' AND '.join(where)}"
-
-    query = (
-        "SELECT id, site_name, feed_url, source_type, creator_tag, is_enabled, "
-        "fetch_interval_min, last_fetched_at, created_at FROM sources "
-        f"{where_clause} ORDER BY created_at DESC"
-    )
+) -> ORJSONResponse:
+    params = {
+        "is_enabled": None if enabled is None else (1 if enabled else 0),
+        "source_type": source_type or None,
+    }
 
-    with get_connection() as conn:
-        logger.info("DBクエリ開始: list_sources")
-        rows = conn.execute(query, params).fetchall()
-        logger.info("DBクエリ終了: list_sources")
+    def query_rows() -> list[dict]:
+        with get_connection() as conn:
+            logger.info("DBクエリ開始: list_sources")
+            rows = rows_to_dicts(conn.execute(SOURCES_LIST_SQL, params))
+            logger.info("DBクエリ終了: list_sources")
+        for row in rows:
+            row["is_enabled"] = bool(row["is_enabled"])
+        return rows
 
-    logger.info("JSON化開始: list_sources")
-    sources = [SourceOut(**row) for row in rows]
-    logger.info("JSON化終了: list_sources")
-    return sources
+    return ORJSONResponse(await cached_list(("sources", params["is_enabled"], params["source_type"]), query_rows))
 
 
 @app.post("/sources", response_model=SourceOut)
-def create_source(payload: SourceIn) -> SourceOut:
-    with get_connection() as conn:
-        cur = conn.execute(
-            "INSERT INTO sources (site_name, feed_url, source_type, creator_tag, is_enabled, fetch_interval_min) "
-            "VALUES (?, ?, ?, ?, ?, ?)",
-            (
-                payload.site_name,
-                str(payload.feed_url),
-                payload.source_type,
-                payload.creator_tag,
-                1 if payload.is_enabled else 0,
-                payload.fetch_interval_min,
-            ),
-        )
-        source_id = cur.lastrowid
-        row = conn.execute(
-            "SELECT id, site_name, feed_url, source_type, creator_tag, is_enabled, "
-            "fetch_interval_min, last_fetched_at, created_at FROM sources WHERE id = ?",
-            (source_id,),
-        ).fetchone()
-        conn.commit()
-    return SourceOut(**row)
+async def create_source(payload: SourceIn) -> SourceOut:
+    def insert() -> sqlite3.Row:
+        with get_connection() as conn, write_transaction(conn):
+            return conn.execute(
+                INSERT_SOURCE_SQL,
+                (
+                    payload.site_name,
+                    payload.feed_url,
+                    payload.source_type,
+                    payload.creator_tag,
+                    1 if payload.is_enabled else 0,
+                    payload.fetch_interval_min,
+                ),
+            ).fetchone()
+
+    row = await run_write(insert)
+    invalidate_site_names()
+    invalidate_list_cache()
+    return source_out(row)
 
 
 @app.put("/sources/{source_id}", response_model=SourceOut)
-def update_source(source_id: int, payload: SourceIn) -> SourceOut:
-    with get_connection() as conn:
-        cur = conn.execute(
-            "UPDATE sources SET site_name = ?, feed_url = ?, source_type = ?, creator_tag = ?, "
-            "is_enabled = ?, fetch_interval_min = ? WHERE id = ?",
-            (
-                payload.site_name,
-                str(payload.feed_url),
-                payload.source_type,
-                payload.creator_tag,
-                1 if payload.is_enabled else 0,
-                payload.fetch_interval_min,
-                source_id,
-            ),
-        )
-        if cur.rowcount == 0:
-            raise HTTPException(status_code=404, detail="source not found")
-        row = conn.execute(
-            "SELECT id, site_name, feed_url, source_type, creator_tag, is_enabled, "
-            "fetch_interval_min, last_fetched_at, created_at FROM sources WHERE id = ?",
-            (source_id,),
-        ).fetchone()
-        conn.commit()
-    return SourceOut(**row)
+async def update_source(source_id: int, payload: SourceIn) -> SourceOut:
+    def update() -> sqlite3.Row:
+        with get_connection() as conn, write_transaction(conn):
+            row = conn.execute(
+                UPDATE_SOURCE_SQL,
+                (
+                    payload.site_name,
+                    payload.feed_url,
+                    payload.source_type,
+                    payload.creator_tag,
+                    1 if payload.is_enabled else 0,
+                    payload.fetch_interval_min,
+                    source_id,
+                ),
+            ).fetchone()
+            if not row:
+                raise HTTPException(status_code=404, detail="source not found")
+        return row
+
+    row = await run_write(update)
+    invalidate_site_names()
+    invalidate_list_cache()
+    return source_out(row)
 
 
 @app.delete("/sources/{source_id}")
-def delete_source(source_id: int) -> dict:
-    with get_connection() as conn:
-        cur = conn.execute("DELETE FROM sources WHERE id = ?", (source_id,))
-        if cur.rowcount == 0:
-            raise HTTPException(status_code=404, detail="source not found")
-        conn.commit()
+async def delete_source(source_id: int) -> dict:
+    def delete() -> None:
+        with get_connection() as conn, write_transaction(conn):
+            cur = conn.execute("DELETE FROM sources WHERE id = ?", (source_id,))
+            if cur.rowcount == 0:
+                raise HTTPException(status_code=404, detail="source not found")
+
+    await run_write(delete)
+    invalidate_site_names()
+    invalidate_list_cache()
     return {"deleted": True}
 
 
-@app.get("/author-rules")
-def list_author_rules(
+@app.get("/author-rules", response_model=None)
+async def list_author_rules(
     source_id: Optional[int] = None,
     rule_type: Optional[str] = None,
     q: Optional[str] = None,
-) -> list[dict]:
-    where = []
-    params: list[object] = []
-    if source_id is not None:
-        where.append("ar.source_id = ?")
-        params.append(source_id)
-    if rule_type:
-        where.append("ar.rule_type = ?")
-        params.append(rule_type)
-    if q:
-        where.append("ar.creator_name LIKE ?")
-        params.append(f"%{q}%")
-
-    where_clause = f"WHERE {' AND '.join(where)}" if where else ""
-    query = (
-        "SELECT ar.id, ar.source_id, s.site_name, ar.creator_name, ar.rule_type, ar.memo, "
-        "ar.created_at FROM author_rules ar JOIN sources s ON s.id = ar.source_id "
-        f"{where_clause} ORDER BY ar.created_at DESC"
-    )
+) -> ORJSONResponse:
+    params = {
+        "source_id": source_id,
+        "rule_type": rule_type or None,
+        "creator_like": like_contains(q) if q else None,
+    }
 
-    with get_connection() as conn:
-        logger.info("DBクエリ開始: list_author_rules")
-        rows = conn.execute(query, params).fetchall()
-        logger.info("DBクエリ終了: list_author_rules")
+    def query_rows() -> list[dict]:
+        with get_connection() as conn:
+            logger.info("DBクエリ開始: list_author_rules")
+            rows = rows_to_dicts(conn.execute(AUTHOR_RULES_LIST_SQL, params))
+            logger.info("DBクエリ終了: list_author_rules")
+        return rows
 
-    logger.info("JSON化開始: list_author_rules")
-    result = rows_to_dicts(rows)
-    logger.info("JSON化終了: list_author_rules")
-    return result
+    return ORJSONResponse(await cached_list(("author_rules", *params.values()), query_rows))
 
 
 @app.post("/author-rules")
-def create_author_rule(payload: AuthorRuleIn) -> dict:
-    with get_connection() as conn:
-        try:
-            cur = conn.execute(
-                "INSERT INTO author_rules (source_id, creator_name, rule_type, memo) VALUES (?, ?, ?, ?)",
-                (payload.source_id, payload.creator_name, payload.rule_type, payload.memo),
-            )
-        except Exception as exc:
-            if "UNIQUE" in str(exc):
-                raise HTTPException(status_code=409, detail="author rule already exists")
-            raise
-        rule_id = cur.lastrowid
-        row = conn.execute(
-            "SELECT id, source_id, creator_name, rule_type, memo, created_at "
-            "FROM author_rules WHERE id = ?",
-            (rule_id,),
-        ).fetchone()
-        conn.commit()
+async def create_author_rule(payload: AuthorRuleIn) -> dict:
+    def insert() -> sqlite3.Row:
+        with get_connection() as conn, write_transaction(conn):
+            try:
+                row = conn.execute(
+                    INSERT_AUTHOR_RULE_SQL,
+                    (payload.source_id, payload.creator_name, payload.rule_type, payload.memo),
+                ).fetchone()
+            except Exception as exc:
+                if "UNIQUE" in str(exc):
+                    raise HTTPException(status_code=409, detail="author rule already exists")
+                raise
+            if row["rule_type"] == "block":
+                ignore_blocked_unread_items(conn, row["source_id"], row["creator_name"])
+        return row
+
+    row = await run_write(insert)
+    invalidate_list_cache()
     return dict(row)
 
 
 @app.put("/author-rules/{rule_id}")
-def update_author_rule(rule_id: int, payload: AuthorRuleIn) -> dict:
-    with get_connection() as conn:
-        cur = conn.execute(
-            "UPDATE author_rules SET source_id = ?, creator_name = ?, rule_type = ?, memo = ? WHERE id = ?",
-            (payload.source_id, payload.creator_name, payload.rule_type, payload.memo, rule_id),
-        )
-        if cur.rowcount == 0:
-            raise HTTPException(status_code=404, detail="author rule not found")
-        row = conn.execute(
-            "SELECT id, source_id, creator_name, rule_type, memo, created_at "
-            "FROM author_rules WHERE id = ?",
-            (rule_id,),
-        ).fetchone()
-        conn.commit()
+async def update_author_rule(rule_id: int, payload: AuthorRuleIn) -> dict:
+    def update() -> sqlite3.Row:
+        with get_connection() as conn, write_transaction(conn):
+            row = conn.execute(
+                UPDATE_AUTHOR_RULE_SQL,
+                (payload.source_id, payload.creator_name, payload.rule_type, payload.memo, rule_id),
+            ).fetchone()
+            if not row:
+                raise HTTPException(status_code=404, detail="author rule not found")
+            if row["rule_type"] == "block":
+                ignore_blocked_unread_items(conn, row["source_id"], row["creator_name"])
+        return row
+
+    row = await run_write(update)
+    invalidate_list_cache()
     return dict(row)
 
 
 @app.delete("/author-rules/{rule_id}")
-def delete_author_rule(rule_id: int) -> dict:
-    with get_connection() as conn:
-        cur = conn.execute("DELETE FROM author_rules WHERE id = ?", (rule_id,))
-        if cur.rowcount == 0:
-            raise HTTPException(status_code=404, detail="author rule not found")
-        conn.commit()
+async def delete_author_rule(rule_id: int) -> dict:
+    def delete() -> None:
+        with get_connection() as conn, write_transaction(conn):
+            cur = conn.execute("DELETE FROM author_rules WHERE id = ?", (rule_id,))
+            if cur.rowcount == 0:
+                raise HTTPException(status_code=404, detail="author rule not found")
+
+    await run_write(delete)
+    invalidate_list_cache()
     return {"deleted": True}
 
 
-@app.get("/keyword-rules")
-def list_keyword_rules(rule_type: Optional[str] = None) -> list[dict]:
-    where = []
-    params: list[object] = []
-    if rule_type:
-        where.append("rule_type = ?")
-        params.append(rule_type)
-    where_clause = f"WHERE {' AND '.join(where)}" if where else ""
-    query = (
-        "SELECT id, keyword, rule_type, created_at FROM keyword_rules "
-        f"{where_clause} ORDER BY created_at DESC"
-    )
+@app.get("/keyword-rules", response_model=None)
+async def list_keyword_rules(rule_type: Optional[str] = None) -> ORJSONResponse:
+    params = {"rule_type": rule_type or None}
 
-    with get_connection() as conn:
-        logger.info("DBクエリ開始: list_keyword_rules")
-        rows = conn.execute(query, params).fetchall()
-        logger.info("DBクエリ終了: list_keyword_rules")
+    def query_rows() -> list[dict]:
+        with get_connection() as conn:
+            logger.info("DBクエリ開始: list_keyword_rules")
+            rows = rows_to_dicts(conn.execute(KEYWORD_RULES_LIST_SQL, params))
+            logger.info("DBクエリ終了: list_keyword_rules")
+        return rows
 
-    logger.info("JSON化開始: list_keyword_rules")
-    result = rows_to_dicts(rows)
-    logger.info("JSON化終了: list_keyword_rules")
-    return result
+    return ORJSONResponse(await cached_list(("keyword_rules", params["rule_type"]), query_rows))
 
 
 @app.post("/keyword-rules")
-def create_keyword_rule(payload: KeywordRuleIn) -> dict:
-    with get_connection() as conn:
-        cur = conn.execute(
-            "INSERT INTO keyword_rules (keyword, rule_type) VALUES (?, ?)",
-            (payload.keyword, payload.rule_type),
-        )
-        rule_id = cur.lastrowid
-        row = conn.execute(
-            "SELECT id, keyword, rule_type, created_at FROM keyword_rules WHERE id = ?",
-            (rule_id,),
-        ).fetchone()
-        conn.commit()
+async def create_keyword_rule(payload: KeywordRuleIn) -> dict:
+    def insert() -> sqlite3.Row:
+        with get_connection() as conn, write_transaction(conn):
+            return conn.execute(INSERT_KEYWORD_RULE_SQL, (payload.keyword, payload.rule_type)).fetchone()
+
+    row = await run_write(insert)
+    invalidate_list_cache()
     return dict(row)
 
 
 @app.put("/keyword-rules/{rule_id}")
-def update_keyword_rule(rule_id: int, payload: KeywordRuleIn) -> dict:
-    with get_connection() as conn:
-        cur = conn.execute(
-            "UPDATE keyword_rules SET keyword = ?, rule_type = ? WHERE id = ?",
-            (payload.keyword, payload.rule_type, rule_id),
-        )
-        if cur.rowcount == 0:
-            raise HTTPException(status_code=404, detail="keyword rule not found")
-        row = conn.execute(
-            "SELECT id, keyword, rule_type, created_at FROM keyword_rules WHERE id = ?",
-            (rule_id,),
-        ).fetchone()
-        conn.commit()
+async def update_keyword_rule(rule_id: int, payload: KeywordRuleIn) -> dict:
+    def update() -> sqlite3.Row:
+        with get_connection() as conn, write_transaction(conn):
+            row = conn.execute(
+                UPDATE_KEYWORD_RULE_SQL, (payload.keyword, payload.rule_type, rule_id)
+            ).fetchone()
+            if not row:
+                raise HTTPException(status_code=404, detail="keyword rule not found")
+        return row
+
+    row = await run_write(update)
+    invalidate_list_cache()
     return dict(row)
 
 
 @app.delete("/keyword-rules/{rule_id}")
-def delete_keyword_rule(rule_id: int) -> dict:
-    with get_connection() as conn:
-        cur = conn.execute("DELETE FROM keyword_rules WHERE id = ?", (rule_id,))
-        if cur.rowcount == 0:
-            raise HTTPException(status_code=404, detail="keyword rule not found")
-        conn.commit()
+async def delete_keyword_rule(rule_id: int) -> dict:
+    def delete() -> None:
+        with get_connection() as conn, write_transaction(conn):
+            cur = conn.execute("DELETE FROM keyword_rules WHERE id = ?", (rule_id,))
+            if cur.rowcount == 0:
+                raise HTTPException(status_code=404, detail="keyword rule not found")
+
+    await run_write(delete)
+    invalidate_list_cache()
     return {"deleted": True}
 
 
 @app.post("/jobs/fetch-now")
 def fetch_now(payload: FetchJobRequest) -> dict:
+    global job_status
     sources = payload.source_ids or []
-    job_status.last_run_at = datetime.utcnow().isoformat() + "Z"
-    job_status.last_run_sources = sources
-    job_status.last_error = None
+    status = FetchJobStatus(
+        last_run_at=datetime.now(timezone.utc).isoformat().replace("+00:00", "Z"),
+        last_run_sources=sources,
+        last_error=None,
+    )
+    with job_status_lock:
+        job_status = status
     return {"started": True, "source_ids": sources}
 
 
 @app.get("/jobs/status", response_model=FetchJobStatus)
 def fetch_status() -> FetchJobStatus:
-    return job_status
+    with job_status_lock:
+        return job_status
+
+
+def source_out(row: sqlite3.Row) -> SourceOut:
+    # model_construct skips validation, so the stored 0/1 flag is turned into the bool the
+    # field declares here, as list_sources does; everything else is already the declared type.
+    source = dict(row)
+    source["is_enabled"] = bool(source["is_enabled"])
+    return SourceOut.model_construct(**source)
 
 
 def update_item_tags(conn, item_id: int, tags: list[str]) -> None:
-    clean_tags = [tag.strip() for tag in tags if tag.strip()]
+    clean_tags = list(dict.fromkeys(tag.strip() for tag in tags if tag.strip()))
     conn.execute("DELETE FROM item_tags WHERE item_id = ?", (item_id,))
     if not clean_tags:
         return
-    for tag in clean_tags:
-        conn.execute("INSERT OR IGNORE INTO tags (name) VALUES (?)", (tag,))
-        tag_id = conn.execute("SELECT id FROM tags WHERE name = ?", (tag,)).fetchone()[0]
-        conn.execute("INSERT OR IGNORE INTO item_tags (item_id, tag_id) VALUES (?, ?)", (item_id, tag_id))
\ No newline at end of file
+    tags_json = json.dumps(clean_tags, ensure_ascii=False)
+    conn.execute(INSERT_TAGS_SQL, (tags_json,))
+    conn.execute(LINK_ITEM_TAGS_SQL, (item_id, tags_json))
+
+
+def title_search_params(q: Optional[str], min_length: int = 1) -> tuple[Optional[str], Optional[str]]:
+    # Returns (fts_query, title_like) for TITLE_SEARCH_SQL. The trigram tokenizer needs at
+    # least three characters; shorter queries fall back to LIKE.
+    if not q or len(q) < min_length:
+        return None, None
+    if len(q) >= FTS_TRIGRAM_MIN_LENGTH:
+        return '"' + q.replace('"', '""') + '"', None
+    return None, like_contains(q)
+
+
+def like_contains(value: str) -> str:
+    # Bound substring patterns escape LIKE wildcards so user input matches literally.
+    escaped = value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"%{escaped}%"
+
+
+def item_list_query(
+    queries: dict[tuple[str, bool], str],
+    params: dict[str, object],
+    sort: str,
+    limit: int,
+    offset: int,
+    cursor_key: Optional[str],
+    cursor_id: Optional[int],
+) -> str:
+    params.update(limit=limit, offset=offset)
+    if cursor_id is None:
+        return queries[sort, False]
+    if cursor_key is None:
+        raise HTTPException(status_code=400, detail="cursor_key is required with cursor_id")
+    params.update(cursor_key=cursor_key, cursor_id=cursor_id, offset=0)
+    return queries[sort, True]
+
+
+def page_total(
+    conn: sqlite3.Connection,
+    count_sql: str,
+    params: dict[str, object],
+    items: list[dict],
+    limit: int,
+    offset: int,
+    cursor_id: Optional[int],
+) -> int:
+    # A short, non-empty (or first) offset page already tells the total, so the COUNT pass is
+    # only needed when more rows may follow or a cursor hides the rows before this page.
+    if cursor_id is None and len(items) < limit and (items or offset == 0):
+        return offset + len(items)
+    return conn.execute(count_sql, params).fetchone()[0]
+
+
+def next_item_cursor(items: list[dict], limit: int, sort: str) -> Optional[dict]:
+    if not items or len(items) < limit:
+        return None
+    last = items[-1]
+    if sort in ("fetched_desc", "fetched_asc"):
+        key = last["fetched_at"]
+    else:
+        key = next((v for v in (last["published_at"], last["published_date"]) if v is not None), "")
+    return {"cursor_key": key, "cursor_id": last["id"]}
\ No newline at end of file
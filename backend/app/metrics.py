@@ -1,150 +1,180 @@
 from __future__ import annotations
 
 from datetime import datetime, timezone
-from html import unescape
-from typing import Iterable
-from urllib.request import Request, urlopen
 
-from bs4 import BeautifulSoup, NavigableString, Tag
+from selectolax.parser import HTMLParser, Node
+
+from .http_client import RateLimiter, fetch_bytes
 
 NOTE_DOMAIN_PREFIX = "https://note.com/"
-REQUEST_TIMEOUT = 30
 USER_AGENT = "rss-reader-metrics/1.0"
+# Every note.com page fetch in the process, from the API or the fetch script, starts through
+# this one limiter. A fetch + parse takes around a second or two, so two workers keep the
+# limiter busy; more would only queue on it.
+NOTE_REQUEST_INTERVAL_SEC = 1.0
+NOTE_METRICS_WORKERS = 2
+note_rate_limiter = RateLimiter(NOTE_REQUEST_INTERVAL_SEC)
 
-PAYWALL_SELECTOR = (
-    "#__layout > div > div:nth-child(1) > div:nth-child(3) > main > "
-    "div.p-article__articleWrapper > article > div.p-article__paywall"
-)
-BODY_SELECTOR = (
-    "#__layout > div > div:nth-child(1) > div:nth-child(3) > main > "
-    "div.p-article__articleWrapper > article > div.p-article__content.pb-4 > "
-    "div > div > div.note-common-styles__textnote-body"
-)
+# Matched by class inside the article rather than by the full nth-child path from #__layout,
+# so the match does not depend on note.com's wrapper layout.
+PAYWALL_SELECTOR = "article div.p-article__paywall"
+BODY_SELECTOR = "article div.note-common-styles__textnote-body"
 
 
 def is_note_link(link: str) -> bool:
     return link.startswith(NOTE_DOMAIN_PREFIX)
 
 
-def fetch_html(url: str) -> str:
-    request = Request(url, headers={"User-Agent": USER_AGENT})
-    with urlopen(request, timeout=REQUEST_TIMEOUT) as response:
-        charset = response.headers.get_content_charset() or "utf-8"
-        return response.read().decode(charset, errors="replace")
-
+def fetch_html(url: str) -> bytes:
+    return fetch_bytes(url, USER_AGENT)
 
-def count_allowed_text(element: Tag, allowed_tags: set[str]) -> int:
-    total = 0
-    for descendant in element.descendants:
-        if isinstance(descendant, NavigableString):
-            parent = descendant.parent
-            if parent and parent.name in allowed_tags:
-                total += len(unescape(str(descendant)))
-    return total
 
-
-def has_ancestor(tag: Tag, names: set[str]) -> bool:
-    return any(parent.name in names for parent in tag.parents if isinstance(parent, Tag))
+METRIC_KEYS = (
+    "h2_count",
+    "h3_count",
+    "figure_count",
+    "iframe_count",
+    "blockquote_p_count",
+    "total_character_count",
+    "p_count",
+    "br_in_p_count",
+    "period_count",
+    "link_count",
+)
 
 
-def select_unique(elements: Iterable[Tag]) -> list[Tag]:
-    seen: set[int] = set()
-    unique = []
-    for element in elements:
-        identity = id(element)
-        if identity in seen:
+def walk_metrics(body: Node, counts: dict[str, int]) -> None:
+    # One pass over the article body. An explicit stack rather than recursion, so deeply
+    # nested (malformed or hostile) markup cannot hit the interpreter's recursion limit. Each
+    # entry carries the state of its node's ancestors; the depths count enclosing elements
+    # that each tally their own descendants, which keeps the per-element semantics of the old
+    # selectors:
+    #   p_depth      - text containers: <p> outside ul/ol/blockquote, and figure > blockquote > p
+    #   li_depth     - text containers: ul > li and ol > li
+    #   target_depth - <p> counted for p/br/period metrics (the above plus any p under ul/ol > li)
+    # No count depends on sibling order, so children are pushed as they come.
+    stack = [(child, 0, 0, 0, False, False, False) for child in body.iter(include_text=True)]
+    while stack:
+        node, p_depth, li_depth, target_depth, in_ul_li, in_ol_li, in_list = stack.pop()
+        tag = node.tag
+        if tag == "-text":
+            parent_tag = node.parent.tag
+            if parent_tag == "p":
+                containers = p_depth
+            elif parent_tag == "li":
+                containers = li_depth
+            elif parent_tag == "s" or parent_tag == "a":
+                containers = p_depth + li_depth
+            else:
+                containers = 0
+            if not containers and not target_depth:
+                # Outside every counted element: skip materializing the text at all.
+                continue
+            # Text nodes come back with entities already decoded. Periods are counted per text
+            # node, so no paragraph's text is ever joined just to count them.
+            text = node.text(deep=False)
+            if containers:
+                counts["total_character_count"] += len(text) * containers
+            if target_depth:
+                counts["period_count"] += text.count("。") * target_depth
             continue
-        seen.add(identity)
-        unique.append(element)
-    return unique
-
 
-def extract_note_metrics(html: str) -> dict[str, int]:
-    soup = BeautifulSoup(html, "html.parser")
-    paywall_element = soup.select_one(PAYWALL_SELECTOR)
-    body = soup.select_one(BODY_SELECTOR)
+        parent = node.parent
+        if tag == "p":
+            is_blockquote_p = parent.tag == "blockquote" and parent.parent.tag == "figure"
+            is_container = is_blockquote_p or not in_list
+            is_target = is_container or in_ul_li or in_ol_li
+            counts["blockquote_p_count"] += is_blockquote_p
+            counts["p_count"] += is_target
+            p_depth += is_container
+            target_depth += is_target
+        elif tag == "li":
+            if parent.tag == "ul":
+                in_ul_li = True
+                li_depth += 1
+            elif parent.tag == "ol":
+                in_ol_li = True
+                li_depth += 1
+        elif tag == "a":
+            counts["link_count"] += p_depth + in_ul_li + in_ol_li
+        elif tag == "br":
+            counts["br_in_p_count"] += target_depth
+        elif tag == "h2":
+            counts["h2_count"] += 1
+        elif tag == "h3":
+            counts["h3_count"] += 1
+        elif tag == "figure":
+            counts["figure_count"] += 1
+        elif tag == "iframe":
+            if parent.tag == "div" and parent.parent.tag == "div" and parent.parent.parent.tag == "figure":
+                counts["iframe_count"] += 1
+        elif tag == "ul" or tag == "ol" or tag == "blockquote":
+            in_list = True
+
+        for child in node.iter(include_text=True):
+            stack.append((child, p_depth, li_depth, target_depth, in_ul_li, in_ol_li, in_list))
+
+
+def extract_note_metrics(html: bytes) -> dict[str, int]:
+    tree = HTMLParser(html)
+    paywall_element = tree.css_first(PAYWALL_SELECTOR)
+    body = tree.css_first(BODY_SELECTOR)
     if body is None:
         raise ValueError("note.com article body not found")
 
-    has_purechase_cta = 1 if paywall_element is not None else 0
-
-    h2_count = len(body.select("h2"))
-    h3_count = len(body.select("h3"))
-    figure_count = len(body.select("figure"))
-    iframe_count = len(body.select("figure > div > div > iframe"))
-
-    p_elements = [p for p in body.select("p") if not has_ancestor(p, {"ul", "ol", "blockquote"})]
-    blockquote_p = body.select("figure > blockquote > p")
-    ul_items = body.select("ul > li")
-    ol_items = body.select("ol > li")
-
-    img_count = figure_count - iframe_count - len(blockquote_p)
-
-    total_character_count = sum(count_allowed_text(p, {"p", "s", "a"}) for p in p_elements)
-    total_character_count += sum(count_allowed_text(li, {"li", "s", "a"}) for li in ul_items)
-    total_character_count += sum(count_allowed_text(li, {"li", "s", "a"}) for li in ol_items)
-    total_character_count += sum(count_allowed_text(p, {"p", "s", "a"}) for p in blockquote_p)
-
-    p_in_ul = body.select("ul > li p")
-    p_in_ol = body.select("ol > li p")
-    p_targets = select_unique([*p_elements, *p_in_ul, *p_in_ol, *blockquote_p])
-    p_count = len(p_targets)
-
-    br_in_p_count = sum(len(p.select("br")) for p in p_targets)
-    period_count = sum(p.get_text().count("。") for p in p_targets)
-
-    link_count = iframe_count
-    link_count += sum(len(p.select("a")) for p in p_elements)
-    link_count += len(body.select("ul > li a"))
-    link_count += len(body.select("ol > li a"))
-    link_count += sum(len(p.select("a")) for p in blockquote_p)
+    counts = dict.fromkeys(METRIC_KEYS, 0)
+    walk_metrics(body, counts)
 
     return {
-        "has_purechase_cta": has_purechase_cta,
-        "total_character_count": total_character_count,
-        "h2_count": h2_count,
-        "h3_count": h3_count,
-        "img_count": img_count,
-        "link_count": link_count,
-        "p_count": p_count,
-        "br_in_p_count": br_in_p_count,
-        "period_count": period_count,
+        "has_purechase_cta": 1 if paywall_element is not None else 0,
+        "total_character_count": counts["total_character_count"],
+        "h2_count": counts["h2_count"],
+        "h3_count": counts["h3_count"],
+        "img_count": counts["figure_count"] - counts["iframe_count"] - counts["blockquote_p_count"],
+        "link_count": counts["iframe_count"] + counts["link_count"],
+        "p_count": counts["p_count"],
+        "br_in_p_count": counts["br_in_p_count"],
+        "period_count": counts["period_count"],
     }
 
 
-def process_item_metrics(conn, item_id: int, link: str) -> dict[str, int]:
-    fetched_at = datetime.now(timezone.utc).isoformat()
+def collect_item_metrics(link: str) -> dict[str, int]:
+    # Network and parsing only, so callers can run it off the thread that owns the connection.
     if not is_note_link(link):
-        conn.execute(
-            "UPDATE items SET metrics_status = 'failed', metrics_fetched_at = ? WHERE id = ?",
-            (fetched_at, item_id),
-        )
-        conn.commit()
         raise ValueError("link is not note.com")
-
+    note_rate_limiter.wait()
     try:
-        html = fetch_html(link)
-        metrics = extract_note_metrics(html)
-    except Exception as exc:
-        if isinstance(exc, ValueError) and str(exc) == "note.com article body not found":
-            conn.execute(
-                """
-                UPDATE items
-                SET metrics_status = 'done',
-                    metrics_fetched_at = ?,
-                    has_purechase_cta = 1
-                WHERE id = ?
-                """,
-                (fetched_at, item_id),
-            )
-            conn.commit()
+        return extract_note_metrics(fetch_html(link))
+    except ValueError as exc:
+        if str(exc) == "note.com article body not found":
             return {"has_purechase_cta": 1}
+        raise
+
+
+# The write helpers leave transaction control to the caller: on their own each statement
+# autocommits, and the fetch script stores a whole run inside one write transaction.
+def mark_item_metrics_failed(conn, item_id: int) -> None:
+    conn.execute(
+        "UPDATE items SET metrics_status = 'failed', metrics_fetched_at = ? WHERE id = ?",
+        (datetime.now(timezone.utc).isoformat(), item_id),
+    )
+
+
+def store_item_metrics(conn, item_id: int, metrics: dict[str, int]) -> None:
+    fetched_at = datetime.now(timezone.utc).isoformat()
+    if "total_character_count" not in metrics:
+        # Paywalled article: only the CTA flag is known.
         conn.execute(
-            "UPDATE items SET metrics_status = 'failed', metrics_fetched_at = ? WHERE id = ?",
-            (fetched_at, item_id),
+            """
+            UPDATE items
+            SET metrics_status = 'done',
+                metrics_fetched_at = ?,
+                has_purechase_cta = ?
+            WHERE id = ?
+            """,
+            (fetched_at, metrics["has_purechase_cta"], item_id),
         )
-        conn.commit()
-        raise
+        return
 
     conn.execute(
         """
@@ -176,8 +206,6 @@ def process_item_metrics(conn, item_id: int, link: str) -> dict[str, int]:
             item_id,
         ),
     )
-    conn.commit()
-    return metrics
 
 
 def should_auto_block_item(item: dict) -> bool:
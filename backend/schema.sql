@@ -37,6 +37,9 @@ CREATE TABLE IF NOT EXISTS items (
   creator_name     TEXT,
   published_at     TEXT,
   published_date   TEXT,
+  -- 一覧のソート・日付検索用キー（published_at 優先、無ければ published_date、どちらも無ければ ''）
+  -- 生成列なので取込側は意識不要。既存DBには init_db で ALTER TABLE 追加する
+  published_sort   TEXT    GENERATED ALWAYS AS (COALESCE(published_at, published_date, '')) VIRTUAL,
   fetched_at       TEXT    NOT NULL DEFAULT (datetime('now')),
   status           TEXT    NOT NULL DEFAULT 'unread',
   metrics_status   TEXT    NOT NULL DEFAULT 'pending',
@@ -71,6 +74,56 @@ CREATE INDEX IF NOT EXISTS idx_items_title
 CREATE INDEX IF NOT EXISTS idx_items_creator
   ON items(creator_name);
 
+-- 未評価/保存一覧の絞り込み＋公開日順ソート用
+-- published_sort は日付なしを '' に寄せてNULLを無くしてあるので、(日付, id) のキーセットページングで範囲検索できる
+-- 末尾に暗黙で付く rowid(id) と同じ昇順にしておくと、昇順・降順どちらも索引を辿るだけでソート済みになる
+DROP INDEX IF EXISTS idx_items_status_pub;
+CREATE INDEX idx_items_status_pub
+  ON items(status, published_sort);
+
+DROP INDEX IF EXISTS idx_items_status_source_pub;
+CREATE INDEX idx_items_status_source_pub
+  ON items(status, source_id, published_sort);
+
+DROP INDEX IF EXISTS idx_items_status_fetched;
+CREATE INDEX idx_items_status_fetched
+  ON items(status, fetched_at);
+
+-- 取込バッチの「メトリクス未取得の note.com 記事を新しい順に」用の部分インデックス
+-- 条件式は fetch_rss.py の PENDING_NOTE_ITEMS_SQL とリテラルまで一致させること（一致しないと使われない）
+CREATE INDEX IF NOT EXISTS idx_items_pending_note
+  ON items(published_sort)
+  WHERE metrics_status = 'pending' AND link LIKE 'https://note.com/%';
+
+-- -----------------------------------------
+-- items_fts: タイトル部分検索用（trigramでLIKE '%q%'相当を索引化）
+-- -----------------------------------------
+CREATE VIRTUAL TABLE IF NOT EXISTS items_fts USING fts5(
+  title,
+  content='items',
+  content_rowid='id',
+  tokenize='trigram'
+);
+
+CREATE TRIGGER IF NOT EXISTS trg_items_fts_insert
+AFTER INSERT ON items
+BEGIN
+  INSERT INTO items_fts(rowid, title) VALUES (NEW.id, NEW.title);
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_items_fts_delete
+AFTER DELETE ON items
+BEGIN
+  INSERT INTO items_fts(items_fts, rowid, title) VALUES ('delete', OLD.id, OLD.title);
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_items_fts_update
+AFTER UPDATE OF title ON items
+BEGIN
+  INSERT INTO items_fts(items_fts, rowid, title) VALUES ('delete', OLD.id, OLD.title);
+  INSERT INTO items_fts(rowid, title) VALUES (NEW.id, NEW.title);
+END;
+
 -- -----------------------------------------
 -- tags / item_tags: 保存時タグ（カンマ区切り入力を正規化）
 -- -----------------------------------------
@@ -89,8 +142,10 @@ CREATE TABLE IF NOT EXISTS item_tags (
   FOREIGN KEY (tag_id)  REFERENCES tags(id)  ON DELETE CASCADE
 );
 
-CREATE INDEX IF NOT EXISTS idx_item_tags_tag
-  ON item_tags(tag_id);
+-- タグ別件数集計（list_tags）を item_tags を読まずに索引だけで済ませる
+DROP INDEX IF EXISTS idx_item_tags_tag;
+CREATE INDEX idx_item_tags_tag
+  ON item_tags(tag_id, item_id);
 
 -- -----------------------------------------
 -- author_rules: 著者ルール（CRUD）
@@ -111,6 +166,10 @@ CREATE TABLE IF NOT EXISTS author_rules (
 CREATE INDEX IF NOT EXISTS idx_author_rules_lookup
   ON author_rules(source_id, creator_name);
 
+-- ブロック判定（取得時の除外・未評価の一括無視）用の部分インデックス
+CREATE INDEX IF NOT EXISTS idx_author_rules_block
+  ON author_rules(source_id, creator_name) WHERE rule_type = 'block';
+
 -- -----------------------------------------
 -- keyword_rules: ピックアップ・NGワード（CRUD）
 -- タイトルに対する検索にのみ適用
@@ -129,6 +188,65 @@ CREATE TABLE IF NOT EXISTS keyword_rules (
 CREATE INDEX IF NOT EXISTS idx_keyword_rules_type
   ON keyword_rules(rule_type);
 
+-- タブ一覧・件数集計用の部分インデックス（tabのみ、id順でキーワードまで索引で返す）
+CREATE INDEX IF NOT EXISTS idx_keyword_rules_tab
+  ON keyword_rules(id, keyword) WHERE rule_type = 'tab';
+
+-- -----------------------------------------
+-- item_tab_matches: 記事タイトルとタブ用キーワード(rule_type='tab')の一致結果
+-- 一覧の「その他」タブ・件数集計で部分一致を毎回評価しないよう書き込み時に確定させる
+-- キーワード中の % や _ をワイルドカード扱いしないよう LIKE ではなく instr で判定する
+-- -----------------------------------------
+CREATE TABLE IF NOT EXISTS item_tab_matches (
+  item_id          INTEGER NOT NULL,
+  keyword_rule_id  INTEGER NOT NULL,
+  PRIMARY KEY (item_id, keyword_rule_id),
+  FOREIGN KEY (item_id)         REFERENCES items(id)         ON DELETE CASCADE,
+  FOREIGN KEY (keyword_rule_id) REFERENCES keyword_rules(id) ON DELETE CASCADE
+) WITHOUT ROWID;
+
+CREATE INDEX IF NOT EXISTS idx_item_tab_matches_rule
+  ON item_tab_matches(keyword_rule_id, item_id);
+
+DROP TRIGGER IF EXISTS trg_item_tab_matches_item_insert;
+CREATE TRIGGER trg_item_tab_matches_item_insert
+AFTER INSERT ON items
+BEGIN
+  INSERT OR IGNORE INTO item_tab_matches (item_id, keyword_rule_id)
+  SELECT NEW.id, kr.id FROM keyword_rules kr
+  WHERE kr.rule_type = 'tab' AND instr(lower(NEW.title), lower(kr.keyword)) > 0;
+END;
+
+DROP TRIGGER IF EXISTS trg_item_tab_matches_item_update;
+CREATE TRIGGER trg_item_tab_matches_item_update
+AFTER UPDATE OF title ON items
+BEGIN
+  DELETE FROM item_tab_matches WHERE item_id = NEW.id;
+  INSERT OR IGNORE INTO item_tab_matches (item_id, keyword_rule_id)
+  SELECT NEW.id, kr.id FROM keyword_rules kr
+  WHERE kr.rule_type = 'tab' AND instr(lower(NEW.title), lower(kr.keyword)) > 0;
+END;
+
+DROP TRIGGER IF EXISTS trg_item_tab_matches_rule_insert;
+CREATE TRIGGER trg_item_tab_matches_rule_insert
+AFTER INSERT ON keyword_rules
+WHEN NEW.rule_type = 'tab'
+BEGIN
+  INSERT OR IGNORE INTO item_tab_matches (item_id, keyword_rule_id)
+  SELECT i.id, NEW.id FROM items i
+  WHERE instr(lower(i.title), lower(NEW.keyword)) > 0;
+END;
+
+DROP TRIGGER IF EXISTS trg_item_tab_matches_rule_update;
+CREATE TRIGGER trg_item_tab_matches_rule_update
+AFTER UPDATE OF keyword, rule_type ON keyword_rules
+BEGIN
+  DELETE FROM item_tab_matches WHERE keyword_rule_id = OLD.id;
+  INSERT OR IGNORE INTO item_tab_matches (item_id, keyword_rule_id)
+  SELECT i.id, NEW.id FROM items i
+  WHERE NEW.rule_type = 'tab' AND instr(lower(i.title), lower(NEW.keyword)) > 0;
+END;
+
 -- -----------------------------------------
 -- 便利VIEW（任意）：保存一覧のフィルタ表示用
 -- -----------------------------------------
@@ -1,15 +1,16 @@
 #!/usr/bin/env python3
 from __future__ import annotations
 
-import hashlib
+import fcntl
 import logging
 import sys
-import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from contextlib import suppress
 from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from functools import lru_cache
 from pathlib import Path
-from typing import Iterable, Tuple
-from urllib.request import Request, urlopen
+from typing import IO, Callable, Iterable, Iterator, Tuple
 import xml.etree.ElementTree as ET
 
 from dateutil import parser
@@ -18,8 +19,22 @@ SCRIPT_DIR = Path(__file__).resolve().parent
 BASE_DIR = SCRIPT_DIR.parent
 sys.path.append(str(BASE_DIR))
 
-from app.db import get_connection, init_db  # noqa: E402
-from app.metrics import NOTE_DOMAIN_PREFIX, process_item_metrics, should_auto_block_item  # noqa: E402
+from app.db import (  # noqa: E402
+    fingerprint_for_link,
+    get_connection,
+    ignore_blocked_unread_items,
+    init_db,
+    write_transaction,
+)
+from app.http_client import fetch_text  # noqa: E402
+from app.metrics import (  # noqa: E402
+    NOTE_DOMAIN_PREFIX,
+    NOTE_METRICS_WORKERS,
+    collect_item_metrics,
+    mark_item_metrics_failed,
+    should_auto_block_item,
+    store_item_metrics,
+)
 
 LOG_DIR = BASE_DIR / "logs"
 LOG_FILE = LOG_DIR / "fetch.log"
@@ -27,7 +42,17 @@ DATA_DIR = BASE_DIR / "data"
 LOCK_FILE = DATA_DIR / "fetch.lock"
 
 USER_AGENT = "rss-reader-fetcher/1.0"
-REQUEST_TIMEOUT = 30
+FEED_CHUNK_SIZE = 64 * 1024
+# Network work fans out over threads; every database write stays on the main thread's
+# connection. note.com pages are paced by app.metrics' shared limiter.
+FEED_WORKERS = 4
+# The link filter is a literal, not a bound parameter, so SQLite can match it against the
+# partial index idx_items_pending_note (same WHERE text in schema.sql).
+PENDING_NOTE_ITEMS_SQL = (
+    "SELECT id, link, source_id, creator_name FROM items "
+    f"WHERE metrics_status = 'pending' AND link LIKE '{NOTE_DOMAIN_PREFIX}%' "
+    "ORDER BY published_sort DESC LIMIT 10"
+)
 
 
 def setup_logger() -> logging.Logger:
@@ -49,31 +74,31 @@ def setup_logger() -> logging.Logger:
     return logger
 
 
-def normalize_link(link: str) -> str:
-    normalized = link.strip()
-    if normalized.endswith("/"):
-        normalized = normalized.rstrip("/")
-    return normalized
+def local_name(tag: str) -> str:
+    return tag.rsplit("}", 1)[-1]
 
 
-def fingerprint_for_link(link: str) -> str:
-    normalized = normalize_link(link)
-    return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+def index_children(element: ET.Element) -> dict[str, list[ET.Element]]:
+    # One pass over an entry's children, so each field lookup is a dict hit instead of
+    # another scan that splits every child's namespace.
+    children: dict[str, list[ET.Element]] = {}
+    for child in element:
+        children.setdefault(local_name(child.tag), []).append(child)
+    return children
 
 
-def local_name(tag: str) -> str:
-    return tag.rsplit("}", 1)[-1]
+def first_text(elements: Iterable[ET.Element]) -> str | None:
+    for element in elements:
+        if element.text and element.text.strip():
+            return element.text.strip()
+        href = element.attrib.get("href")
+        if href:
+            return href.strip()
+    return None
 
 
 def text_from_child(element: ET.Element, name: str) -> str | None:
-    for child in element:
-        if local_name(child.tag) == name:
-            if child.text and child.text.strip():
-                return child.text.strip()
-            href = child.attrib.get("href")
-            if href:
-                return href.strip()
-    return None
+    return first_text(child for child in element if local_name(child.tag) == name)
 
 
 def normalize_tag_name(tag: str) -> str:
@@ -86,18 +111,16 @@ def normalize_creator_tag(creator_tag: str) -> str:
     return creator_tag.split(":", 1)[-1].strip()
 
 
-def extract_creator_name(entry: ET.Element, creator_tag: str) -> str | None:
-    tag_name = normalize_creator_tag(creator_tag)
-    for child in entry:
-        if local_name(child.tag) == tag_name:
-            if child.text and child.text.strip():
-                return child.text.strip()
-            nested_name = text_from_child(child, "name")
-            if nested_name:
-                return nested_name
-            attrib_name = child.attrib.get("name")
-            if attrib_name and attrib_name.strip():
-                return attrib_name.strip()
+def extract_creator_name(children: dict[str, list[ET.Element]], tag_name: str) -> str | None:
+    for child in children.get(tag_name, ()):
+        if child.text and child.text.strip():
+            return child.text.strip()
+        nested_name = text_from_child(child, "name")
+        if nested_name:
+            return nested_name
+        attrib_name = child.attrib.get("name")
+        if attrib_name and attrib_name.strip():
+            return attrib_name.strip()
     return None
 
 
@@ -109,14 +132,36 @@ def load_blocked_authors(conn, source_id: int) -> set[str]:
     return {row["creator_name"] for row in rows}
 
 
+def load_known_fingerprints(conn, source_id: int) -> set[str]:
+    rows = conn.execute("SELECT fingerprint FROM items WHERE source_id = ?", (source_id,)).fetchall()
+    return {row["fingerprint"] for row in rows}
+
+
 def parse_pub_date(pub_date: str | None) -> Tuple[str | None, str | None]:
     if not pub_date:
         return None, None
+    published_at = parse_datetime_text(pub_date)
+    if published_at is None:
+        return None, fallback_date(pub_date)
+    return published_at, None
+
+
+@lru_cache(maxsize=4096)
+def parse_datetime_text(pub_date: str) -> str | None:
+    # Feeds use ISO 8601 (Atom, note.com) or RFC 2822 (RSS pubDate); both have stdlib parsers
+    # that are far cheaper than dateutil's general grammar, which stays as the last resort.
+    # The same strings recur across items and sources, hence the cache.
+    with suppress(ValueError):
+        return datetime.fromisoformat(pub_date.replace("Z", "+00:00")).isoformat()
+    with suppress(TypeError, ValueError):
+        parsed = parsedate_to_datetime(pub_date)
+        # A naive result means "-0000" or an unknown zone name; leave those to dateutil.
+        if parsed.tzinfo is not None:
+            return parsed.isoformat()
     try:
-        parsed = parser.parse(pub_date)
-        return parsed.isoformat(), None
+        return parser.parse(pub_date).isoformat()
     except (ValueError, OverflowError):
-        return None, fallback_date(pub_date)
+        return None
 
 
 def fallback_date(pub_date: str) -> str:
@@ -130,62 +175,90 @@ def fallback_date(pub_date: str) -> str:
 
 
 def fetch_feed(url: str) -> str:
-    request = Request(url, headers={"User-Agent": USER_AGENT})
-    with urlopen(request, timeout=REQUEST_TIMEOUT) as response:
-        charset = response.headers.get_content_charset() or "utf-8"
-        return response.read().decode(charset, errors="replace")
+    return fetch_text(url, USER_AGENT)
+
 
+def iter_entries(xml: str) -> Iterator[dict[str, list[ET.Element]]]:
+    # Streams the feed instead of building the whole tree: each RSS <item> / Atom <entry> is
+    # indexed when it closes and then cleared. Whichever of the two appears first is used.
+    xml_parser = ET.XMLPullParser(events=("end",))
+    entry_name = None
+
+    def closed_entries() -> Iterator[dict[str, list[ET.Element]]]:
+        nonlocal entry_name
+        for _, element in xml_parser.read_events():
+            name = local_name(element.tag)
+            if name not in ("item", "entry") or entry_name not in (None, name):
+                continue
+            entry_name = name
+            yield index_children(element)
+            element.clear()
 
-def iter_entries(root: ET.Element) -> Iterable[ET.Element]:
-    entries = [element for element in root.iter() if local_name(element.tag) == "item"]
-    if entries:
-        return entries
-    return [element for element in root.iter() if local_name(element.tag) == "entry"]
+    for start in range(0, len(xml), FEED_CHUNK_SIZE):
+        xml_parser.feed(xml[start : start + FEED_CHUNK_SIZE])
+        yield from closed_entries()
+    xml_parser.close()
+    yield from closed_entries()
 
 
-def process_source(conn, logger: logging.Logger, source: dict) -> bool:
+def process_source(conn, logger: logging.Logger, source: dict, fetch: Callable[[], str]) -> bool:
     source_id = source["id"]
     feed_url = source["feed_url"]
-    creator_tag = source["creator_tag"]
+    creator_tag_name = normalize_creator_tag(source["creator_tag"])
     blocked_authors = load_blocked_authors(conn, source_id)
+    known_fingerprints = load_known_fingerprints(conn, source_id)
     now_iso = datetime.now(timezone.utc).isoformat()
     try:
-        xml_text = fetch_feed(feed_url)
-        root = ET.fromstring(xml_text)
-        inserted = 0
-        for entry in iter_entries(root):
-            title = text_from_child(entry, "title")
-            link = text_from_child(entry, "link")
-            pub_date = text_from_child(entry, "pubDate")
-            if not pub_date:
-                pub_date = text_from_child(entry, "published") or text_from_child(entry, "updated")
+        xml = fetch()
+        rows = []
+        entry_count = 0
+        for children in iter_entries(xml):
+            entry_count += 1
+            title = first_text(children.get("title", ()))
+            link = first_text(children.get("link", ()))
+            pub_date = (
+                first_text(children.get("pubDate", ()))
+                or first_text(children.get("published", ()))
+                or first_text(children.get("updated", ()))
+            )
             if not title or not link:
                 logger.info("skip item: missing title/link source_id=%s", source_id)
                 continue
-            creator_name = extract_creator_name(entry, creator_tag)
+            # Items already stored for this source are dropped here, before any author or
+            # date work, so the insert below only sees new links.
+            fingerprint = fingerprint_for_link(link)
+            if fingerprint in known_fingerprints:
+                continue
+            known_fingerprints.add(fingerprint)
+            creator_name = extract_creator_name(children, creator_tag_name)
             if creator_name and creator_name in blocked_authors:
                 logger.info(
                     "skip item: blocked author source_id=%s creator=%s", source_id, creator_name
                 )
                 continue
             published_at, published_date = parse_pub_date(pub_date)
-            fingerprint = fingerprint_for_link(link)
-            conn.execute(
+            rows.append((source_id, title, link, creator_name, published_at, published_date, fingerprint))
+        # Parse first, then write the whole feed in one short transaction.
+        with write_transaction(conn):
+            inserted = conn.executemany(
                 """
                 INSERT OR IGNORE INTO items
                     (source_id, title, link, creator_name, published_at, published_date, fingerprint)
                 VALUES (?, ?, ?, ?, ?, ?, ?)
                 """,
-                (source_id, title, link, creator_name, published_at, published_date, fingerprint),
+                rows,
+            ).rowcount
+            conn.execute(
+                "UPDATE sources SET last_fetched_at = ? WHERE id = ?",
+                (now_iso, source_id),
             )
-            inserted += 1
-        conn.execute(
-            "UPDATE sources SET last_fetched_at = ? WHERE id = ?",
-            (now_iso, source_id),
-        )
-        conn.commit()
         logger.info(
-            "fetched source_id=%s url=%s items=%s", source_id, feed_url, inserted
+            "fetched source_id=%s url=%s items=%s new=%s inserted=%s",
+            source_id,
+            feed_url,
+            entry_count,
+            len(rows),
+            inserted,
         )
         return True
     except Exception:
@@ -195,62 +268,50 @@ def process_source(conn, logger: logging.Logger, source: dict) -> bool:
                 "UPDATE sources SET last_fetched_at = ? WHERE id = ?",
                 (now_iso, source_id),
             )
-            conn.commit()
         return False
 
 
-def acquire_lock() -> bool:
+def acquire_lock() -> IO[str] | None:
+    # Advisory lock held for the life of the open file: the OS drops it when the handle is
+    # closed or the process dies, so a crashed run never leaves a stale lock behind.
     DATA_DIR.mkdir(parents=True, exist_ok=True)
+    lock_file = LOCK_FILE.open("a")
     try:
-        LOCK_FILE.touch(exist_ok=False)
-    except FileExistsError:
-        return False
-    return True
-
-
-def apply_auto_block(conn, logger: logging.Logger, item_id: int) -> None:
-    metrics_row = conn.execute(
+        fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except BlockingIOError:
+        lock_file.close()
+        return None
+    return lock_file
+
+
+def apply_auto_block(conn, logger: logging.Logger, item, metrics: dict[str, int]) -> None:
+    # Judged on the metrics just written rather than re-reading the row. Runs inside the
+    # caller's write transaction.
+    item_id = item["id"]
+    if not item["creator_name"] or not should_auto_block_item(metrics):
+        return
+    conn.execute(
         """
-        SELECT source_id, creator_name, total_character_count, h2_count, h3_count,
-               p_count, br_in_p_count, period_count
-        FROM items WHERE id = ?
+        INSERT OR IGNORE INTO author_rules (source_id, creator_name, rule_type)
+        VALUES (?, ?, 'block')
         """,
-        (item_id,),
-    ).fetchone()
-    if not metrics_row or not metrics_row["creator_name"]:
-        return
-    if not should_auto_block_item(dict(metrics_row)):
-        return
-    try:
-        conn.execute(
-            """
-            INSERT INTO author_rules (source_id, creator_name, rule_type)
-            VALUES (?, ?, 'block')
-            """,
-            (metrics_row["source_id"], metrics_row["creator_name"]),
-        )
-    except Exception as exc:
-        if "UNIQUE" not in str(exc):
-            raise
+        (item["source_id"], item["creator_name"]),
+    )
     conn.execute("UPDATE items SET status = 'ignored' WHERE id = ?", (item_id,))
-    conn.commit()
+    ignore_blocked_unread_items(conn, item["source_id"], item["creator_name"])
     logger.info(
         "auto-blocked item_id=%s source_id=%s creator=%s",
         item_id,
-        metrics_row["source_id"],
-        metrics_row["creator_name"],
+        item["source_id"],
+        item["creator_name"],
     )
 
 
-def release_lock() -> None:
-    with suppress(FileNotFoundError):
-        LOCK_FILE.unlink()
-
-
 def run_fetch(interval_minutes: int | None = None) -> int:
     logger = setup_logger()
-    if not acquire_lock():
-        logger.info("lock exists, exiting")
+    lock_file = acquire_lock()
+    if lock_file is None:
+        logger.info("lock held by another run, exiting")
         return 0
 
     try:
@@ -267,27 +328,37 @@ def run_fetch(interval_minutes: int | None = None) -> int:
                     "WHERE is_enabled = 1 AND fetch_interval_min = ?",
                     (interval_minutes,),
                 ).fetchall()
-            for row in sources:
-                if not process_source(conn, logger, dict(row)):
-                    has_error = True
-            pending_items = conn.execute(
-                """
-                SELECT id, link FROM items
-                WHERE metrics_status = 'pending'
-                AND link LIKE ?
-                ORDER BY COALESCE(published_at, published_date) DESC
-                LIMIT 10
-                """,
-                (f"{NOTE_DOMAIN_PREFIX}%",),
-            ).fetchall()
-            for item in pending_items:
-                try:
-                    logger.info("start item_metrics items id=%s", item["id"])
-                    process_item_metrics(conn, item["id"], item["link"])
-                    apply_auto_block(conn, logger, item["id"])
-                except Exception:
-                    logger.exception("failed metrics item_id=%s", item["id"])
-                time.sleep(5)
+            with ThreadPoolExecutor(max_workers=FEED_WORKERS) as pool:
+                feed_urls = dict.fromkeys(row["feed_url"] for row in sources)
+                feeds = {url: pool.submit(fetch_feed, url) for url in feed_urls}
+                for row in sources:
+                    if not process_source(conn, logger, dict(row), feeds[row["feed_url"]].result):
+                        has_error = True
+            with write_transaction(conn):
+                blocked = ignore_blocked_unread_items(conn)
+            if blocked:
+                logger.info("ignored unread items by blocked authors count=%s", blocked)
+            pending_items = conn.execute(PENDING_NOTE_ITEMS_SQL).fetchall()
+            results = []
+            with ThreadPoolExecutor(max_workers=NOTE_METRICS_WORKERS) as pool:
+                futures = {pool.submit(collect_item_metrics, item["link"]): item for item in pending_items}
+                for future in as_completed(futures):
+                    item = futures[future]
+                    try:
+                        results.append((item, future.result()))
+                    except Exception:
+                        logger.exception("failed metrics item_id=%s", item["id"])
+                        results.append((item, None))
+            # The whole run is written in one transaction once every fetch has finished, so
+            # the write lock is never held while waiting on note.com.
+            with write_transaction(conn):
+                for item, metrics in results:
+                    if metrics is None:
+                        mark_item_metrics_failed(conn, item["id"])
+                        continue
+                    store_item_metrics(conn, item["id"], metrics)
+                    apply_auto_block(conn, logger, item, metrics)
+            logger.info("stored item_metrics count=%s", len(results))
             deleted = conn.execute(
                 """
                 DELETE FROM items
@@ -297,10 +368,11 @@ def run_fetch(interval_minutes: int | None = None) -> int:
             ).rowcount
             if deleted:
                 logger.info("deleted ignored items count=%s", deleted)
-            conn.commit()
+            # Refreshes planner statistics only for tables whose contents changed enough.
+            conn.execute("PRAGMA optimize")
         return 1 if has_error else 0
     finally:
-        release_lock()
+        lock_file.close()
 
 
 def main() -> int:
@@ -0,0 +1,136 @@
+import hashlib
+import sqlite3
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(BACKEND_DIR))
+
+from app import db  # noqa: E402
+
+V1_DDL_PATH = BACKEND_DIR.parent / "SQLite_DDLv1.0.sql"
+
+
+class InitDbMigrationTest(unittest.TestCase):
+    def setUp(self) -> None:
+        tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp_dir.cleanup)
+        self.db_path = Path(tmp_dir.name) / "rss_reader.db"
+        original_pool = db._pool
+        db._pool = db.ConnectionPool(self.db_path)
+        self.addCleanup(setattr, db, "_pool", original_pool)
+        self.addCleanup(self.close_pool)
+
+    def close_pool(self) -> None:
+        while not db._pool._idle.empty():
+            db._pool._idle.get_nowait().close()
+
+    def create_v1_database(self) -> None:
+        conn = sqlite3.connect(self.db_path)
+        try:
+            conn.executescript(V1_DDL_PATH.read_text(encoding="utf-8"))
+            conn.execute(
+                "INSERT INTO sources (site_name, feed_url, source_type) "
+                "VALUES ('note', 'https://note.com/user/rss', 'user')"
+            )
+            link = "https://note.com/user/n/n0123456789ab/"
+            conn.execute(
+                "INSERT INTO items (source_id, link, title, published_at, fingerprint) "
+                "VALUES (1, ?, 'title', '2024-01-02T03:00:00+09:00', ?)",
+                (link, hashlib.sha256(link.rstrip("/").encode("utf-8")).hexdigest()),
+            )
+            conn.commit()
+        finally:
+            conn.close()
+
+    def test_upgrades_v1_ddl_database(self) -> None:
+        self.create_v1_database()
+
+        db.init_db()
+
+        with db.get_connection() as conn:
+            self.assertEqual(conn.execute("PRAGMA user_version").fetchone()[0], db.SCHEMA_VERSION)
+            item = conn.execute(
+                "SELECT link, fingerprint, metrics_status, published_sort FROM items"
+            ).fetchone()
+            self.assertEqual(item["metrics_status"], "pending")
+            self.assertEqual(item["published_sort"], "2024-01-02T03:00:00+09:00")
+            self.assertEqual(item["fingerprint"], db.fingerprint_for_link(item["link"]))
+            index_names = {
+                row["name"] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")
+            }
+            self.assertIn("idx_items_pending_note", index_names)
+            self.assertIn("idx_items_status_pub", index_names)
+
+    def test_indexes_titles_after_interrupted_upgrade(self) -> None:
+        self.create_v1_database()
+        # What an upgrade killed between creating items_fts and rebuilding it left behind.
+        conn = sqlite3.connect(self.db_path)
+        try:
+            conn.execute(
+                "CREATE VIRTUAL TABLE items_fts USING fts5("
+                "title, content='items', content_rowid='id', tokenize='trigram')"
+            )
+            conn.commit()
+        finally:
+            conn.close()
+
+        db.init_db()
+
+        with db.get_connection() as conn:
+            matches = conn.execute("SELECT rowid FROM items_fts WHERE items_fts MATCH 'itl'").fetchall()
+            self.assertEqual(len(matches), 1)
+
+    def test_matches_tab_keywords_after_interrupted_upgrade(self) -> None:
+        self.create_v1_database()
+        # What an upgrade killed between creating item_tab_matches and filling it left behind.
+        conn = sqlite3.connect(self.db_path)
+        try:
+            conn.execute("INSERT INTO keyword_rules (keyword, rule_type) VALUES ('TIT', 'tab')")
+            conn.execute(
+                "CREATE TABLE item_tab_matches ("
+                "item_id INTEGER NOT NULL, keyword_rule_id INTEGER NOT NULL, "
+                "PRIMARY KEY (item_id, keyword_rule_id)) WITHOUT ROWID"
+            )
+            conn.commit()
+        finally:
+            conn.close()
+
+        db.init_db()
+
+        with db.get_connection() as conn:
+            matches = conn.execute("SELECT item_id, keyword_rule_id FROM item_tab_matches").fetchall()
+            self.assertEqual([tuple(row) for row in matches], [(1, 1)])
+
+    def test_failed_upgrade_keeps_old_version(self) -> None:
+        self.create_v1_database()
+        original_schema_path = db.SCHEMA_PATH
+        broken_schema = Path(self.db_path.parent) / "schema.sql"
+        broken_schema.write_text(
+            original_schema_path.read_text(encoding="utf-8") + "\nCREATE TABLE broken (;\n",
+            encoding="utf-8",
+        )
+        db.SCHEMA_PATH = broken_schema
+        self.addCleanup(setattr, db, "SCHEMA_PATH", original_schema_path)
+
+        with self.assertRaises(sqlite3.Error):
+            db.init_db()
+
+        with db.get_connection() as conn:
+            self.assertEqual(conn.execute("PRAGMA user_version").fetchone()[0], 0)
+            self.assertFalse(db.table_exists(conn, "items_fts"))
+
+    def test_init_db_is_idempotent_after_upgrade(self) -> None:
+        self.create_v1_database()
+
+        db.init_db()
+        db.init_db()
+
+        with db.get_connection() as conn:
+            self.assertEqual(conn.execute("SELECT COUNT(*) FROM items").fetchone()[0], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
\ No newline at end of file
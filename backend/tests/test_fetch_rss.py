@@ -0,0 +1,53 @@
+import sys
+import unittest
+from pathlib import Path
+from unittest import mock
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(BACKEND_DIR))
+sys.path.insert(0, str(BACKEND_DIR / "scripts"))
+
+import fetch_rss  # noqa: E402
+from app import http_client  # noqa: E402
+
+
+class FakeResponse:
+    def __init__(self, content: bytes, content_type: str) -> None:
+        self.content = content
+        self.headers = {"Content-Type": content_type}
+
+    def raise_for_status(self) -> None:
+        pass
+
+
+def rss(title: bytes, declaration: bytes = b"") -> bytes:
+    return declaration + b"<rss><channel><item><title>" + title + b"</title></item></channel></rss>"
+
+
+class FetchFeedTest(unittest.TestCase):
+    def titles(self, content: bytes, content_type: str) -> list[str]:
+        response = FakeResponse(content, content_type)
+        with mock.patch.object(http_client.SESSION, "get", return_value=response):
+            xml = fetch_rss.fetch_feed("https://example.com/rss")
+        return [fetch_rss.first_text(children["title"]) for children in fetch_rss.iter_entries(xml)]
+
+    def test_invalid_utf8_byte_is_replaced(self) -> None:
+        titles = self.titles(rss(b"ok \xff bad"), "application/rss+xml; charset=utf-8")
+
+        self.assertEqual(titles, ["ok � bad"])
+
+    def test_missing_charset_defaults_to_utf8(self) -> None:
+        titles = self.titles(rss("日本語".encode("utf-8")), "text/xml")
+
+        self.assertEqual(titles, ["日本語"])
+
+    def test_declared_shift_jis_feed_is_decoded(self) -> None:
+        content = rss("日本語".encode("shift_jis"), b'<?xml version="1.0" encoding="Shift_JIS"?>')
+
+        titles = self.titles(content, "application/rss+xml; charset=Shift_JIS")
+
+        self.assertEqual(titles, ["日本語"])
+
+
+if __name__ == "__main__":
+    unittest.main()
\ No newline at end of file
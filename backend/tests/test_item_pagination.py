@@ -0,0 +1,103 @@
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(BACKEND_DIR))
+
+from app import db  # noqa: E402
+from app.main import (  # noqa: E402
+    ITEM_LIST_COLUMNS,
+    ITEM_SORTS,
+    UNREAD_ITEMS_LIST_SQL,
+    item_list_query,
+    next_item_cursor,
+)
+
+NO_FILTERS = {
+    "source_id": None,
+    "keyword_id": None,
+    "other_tab": None,
+    "keyword_fts": None,
+    "keyword_like": None,
+    "fts_query": None,
+    "title_like": None,
+}
+
+
+class ItemKeysetPaginationTest(unittest.TestCase):
+    def setUp(self) -> None:
+        tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp_dir.cleanup)
+        original_pool = db._pool
+        db._pool = db.ConnectionPool(Path(tmp_dir.name) / "rss_reader.db")
+        self.addCleanup(setattr, db, "_pool", original_pool)
+        self.addCleanup(self.close_pool)
+        db.init_db()
+        with db.get_connection() as conn:
+            conn.execute(
+                "INSERT INTO sources (site_name, feed_url, source_type) "
+                "VALUES ('note', 'https://note.com/user/rss', 'user')"
+            )
+            # Runs of equal sort keys, date-only items, and items with no date at all (whose
+            # published_sort is '').
+            items = [
+                ("2024-01-02T00:00:00+00:00", None, "2024-01-05 00:00:00"),
+                ("2024-01-02T00:00:00+00:00", None, "2024-01-05 00:00:00"),
+                (None, None, "2024-01-05 00:00:00"),
+                ("2024-01-01T00:00:00+00:00", None, "2024-01-04 00:00:00"),
+                (None, "2024-01-03", "2024-01-05 00:00:00"),
+                ("2024-01-02T00:00:00+00:00", None, "2024-01-04 00:00:00"),
+                (None, None, "2024-01-04 00:00:00"),
+                (None, "2024-01-03", "2024-01-06 00:00:00"),
+                ("2024-01-02T00:00:00+00:00", None, "2024-01-05 00:00:00"),
+                (None, None, "2024-01-05 00:00:00"),
+                ("2024-01-04T00:00:00+00:00", None, "2024-01-04 00:00:00"),
+            ]
+            for n, (published_at, published_date, fetched_at) in enumerate(items):
+                conn.execute(
+                    "INSERT INTO items (source_id, title, link, fingerprint, published_at, published_date, fetched_at) "
+                    "VALUES (1, 'title', ?, ?, ?, ?, ?)",
+                    (f"https://note.com/user/n/{n}", str(n), published_at, published_date, fetched_at),
+                )
+
+    def close_pool(self) -> None:
+        while not db._pool._idle.empty():
+            db._pool._idle.get_nowait().close()
+
+    def list_items(self, sort: str, limit: int, offset: int = 0, cursor: dict | None = None) -> list[dict]:
+        cursor = cursor or {}
+        params = dict(NO_FILTERS)
+        query = item_list_query(
+            UNREAD_ITEMS_LIST_SQL, params, sort, limit, offset, cursor.get("cursor_key"), cursor.get("cursor_id")
+        )
+        with db.get_connection() as conn:
+            items = db.rows_to_dicts(conn.execute(query, params), ITEM_LIST_COLUMNS)
+        return items
+
+    def test_cursor_pages_match_offset_pages(self) -> None:
+        for sort in ITEM_SORTS:
+            expected = [item["id"] for item in self.list_items(sort, 100)]
+            self.assertEqual(len(expected), 11)
+            for limit in (1, 2, 3, 4):
+                with self.subTest(sort=sort, limit=limit):
+                    offset_ids = []
+                    for offset in range(0, len(expected), limit):
+                        offset_ids.extend(item["id"] for item in self.list_items(sort, limit, offset))
+                    self.assertEqual(offset_ids, expected)
+
+                    cursor_ids = []
+                    cursor = None
+                    # Bounded, so a cursor that repeats rows fails instead of looping forever.
+                    for _ in range(len(expected) + 1):
+                        items = self.list_items(sort, limit, cursor=cursor)
+                        cursor_ids.extend(item["id"] for item in items)
+                        cursor = next_item_cursor(items, limit, sort)
+                        if cursor is None:
+                            break
+                    self.assertEqual(cursor_ids, expected)
+
+
+if __name__ == "__main__":
+    unittest.main()
\ No newline at end of file
@@ -0,0 +1,102 @@
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(BACKEND_DIR))
+
+from app import db  # noqa: E402
+
+
+class ItemTabMatchesTriggerTest(unittest.TestCase):
+    def setUp(self) -> None:
+        tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp_dir.cleanup)
+        original_pool = db._pool
+        db._pool = db.ConnectionPool(Path(tmp_dir.name) / "rss_reader.db")
+        self.addCleanup(setattr, db, "_pool", original_pool)
+        self.addCleanup(self.close_pool)
+        db.init_db()
+        self.conn = db._pool.acquire()
+        self.addCleanup(db._pool.release, self.conn)
+        self.conn.execute(
+            "INSERT INTO sources (site_name, feed_url, source_type) "
+            "VALUES ('note', 'https://note.com/user/rss', 'user')"
+        )
+
+    def close_pool(self) -> None:
+        while not db._pool._idle.empty():
+            db._pool._idle.get_nowait().close()
+
+    def add_item(self, title: str) -> int:
+        return self.conn.execute(
+            "INSERT INTO items (source_id, title, link, fingerprint) VALUES (1, ?, ?, ?)",
+            (title, f"https://note.com/user/n/{title}", title),
+        ).lastrowid
+
+    def add_rule(self, keyword: str, rule_type: str = "tab") -> int:
+        return self.conn.execute(
+            "INSERT INTO keyword_rules (keyword, rule_type) VALUES (?, ?)", (keyword, rule_type)
+        ).lastrowid
+
+    def matches(self) -> set[tuple[int, int]]:
+        rows = self.conn.execute("SELECT item_id, keyword_rule_id FROM item_tab_matches").fetchall()
+        return {tuple(row) for row in rows}
+
+    def test_item_insert_matches_existing_tab_rules(self) -> None:
+        python = self.add_rule("python")
+        percent = self.add_rule("100%")
+        self.add_rule("python", "mute")
+
+        item = self.add_item("Python入門 100%")
+        self.add_item("100 percent")
+
+        self.assertEqual(self.matches(), {(item, python), (item, percent)})
+
+    def test_title_update_rematches_item(self) -> None:
+        self.add_rule("python")
+        rust = self.add_rule("rust")
+        item = self.add_item("python")
+
+        self.conn.execute("UPDATE items SET title = 'rust' WHERE id = ?", (item,))
+
+        self.assertEqual(self.matches(), {(item, rust)})
+
+    def test_rule_insert_matches_existing_items(self) -> None:
+        first = self.add_item("python tips")
+        self.add_item("rust tips")
+        second = self.add_item("PYTHON news")
+
+        rule = self.add_rule("Python")
+
+        self.assertEqual(self.matches(), {(first, rule), (second, rule)})
+
+    def test_rule_update_rematches_items(self) -> None:
+        python_item = self.add_item("python tips")
+        rust_item = self.add_item("rust tips")
+        rule = self.add_rule("python")
+
+        self.conn.execute("UPDATE keyword_rules SET keyword = 'rust' WHERE id = ?", (rule,))
+        self.assertEqual(self.matches(), {(rust_item, rule)})
+
+        self.conn.execute("UPDATE keyword_rules SET rule_type = 'mute' WHERE id = ?", (rule,))
+        self.assertEqual(self.matches(), set())
+
+        self.conn.execute(
+            "UPDATE keyword_rules SET keyword = 'python', rule_type = 'tab' WHERE id = ?", (rule,)
+        )
+        self.assertEqual(self.matches(), {(python_item, rule)})
+
+    def test_rule_delete_drops_its_matches(self) -> None:
+        item = self.add_item("python rust")
+        python = self.add_rule("python")
+        rust = self.add_rule("rust")
+
+        self.conn.execute("DELETE FROM keyword_rules WHERE id = ?", (python,))
+
+        self.assertEqual(self.matches(), {(item, rust)})
+
+
+if __name__ == "__main__":
+    unittest.main()
\ No newline at end of file
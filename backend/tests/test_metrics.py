@@ -0,0 +1,40 @@
+import sys
+import unittest
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(BACKEND_DIR))
+
+from app.metrics import extract_note_metrics  # noqa: E402
+
+
+def note_page(body_html: str) -> bytes:
+    return (
+        '<html><body><article><div class="note-common-styles__textnote-body">'
+        f"{body_html}</div></article></body></html>"
+    ).encode("utf-8")
+
+
+class ExtractNoteMetricsTest(unittest.TestCase):
+    def test_counts_paragraph_text_links_and_breaks(self) -> None:
+        metrics = extract_note_metrics(note_page('<p>一文。二文。<a href="#">リンク</a><br></p><h2>見出し</h2>'))
+
+        self.assertEqual(metrics["has_purechase_cta"], 0)
+        self.assertEqual(metrics["total_character_count"], 9)
+        self.assertEqual(metrics["p_count"], 1)
+        self.assertEqual(metrics["period_count"], 2)
+        self.assertEqual(metrics["link_count"], 1)
+        self.assertEqual(metrics["br_in_p_count"], 1)
+        self.assertEqual(metrics["h2_count"], 1)
+
+    def test_deeply_nested_body_does_not_recurse(self) -> None:
+        depth = 5000
+        metrics = extract_note_metrics(note_page("<div>" * depth + "<p>深い。</p>" + "</div>" * depth))
+
+        self.assertEqual(metrics["p_count"], 1)
+        self.assertEqual(metrics["total_character_count"], 3)
+        self.assertEqual(metrics["period_count"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
\ No newline at end of file
@@ -0,0 +1,117 @@
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from pydantic import ValidationError
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(BACKEND_DIR))
+
+from app import db, main  # noqa: E402
+from app.main import MetricsBatchIn, fetch_items_metrics  # noqa: E402
+
+GOOD_METRICS = {
+    "has_purechase_cta": 0,
+    "total_character_count": 1000,
+    "h2_count": 1,
+    "h3_count": 1,
+    "img_count": 0,
+    "link_count": 0,
+    "p_count": 10,
+    "br_in_p_count": 10,
+    "period_count": 10,
+}
+# Under 200 characters, which should_auto_block_item flags.
+SHORT_METRICS = {**GOOD_METRICS, "total_character_count": 100}
+
+
+class MetricsBatchTest(unittest.TestCase):
+    def setUp(self) -> None:
+        tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp_dir.cleanup)
+        original_pool = db._pool
+        db._pool = db.ConnectionPool(Path(tmp_dir.name) / "rss_reader.db")
+        self.addCleanup(setattr, db, "_pool", original_pool)
+        self.addCleanup(self.close_pool)
+        db.init_db()
+        with db.get_connection() as conn:
+            conn.execute(
+                "INSERT INTO sources (site_name, feed_url, source_type) "
+                "VALUES ('note', 'https://note.com/user/rss', 'user')"
+            )
+        # Pages by link; links outside note.com still go through the real check, which
+        # rejects them before any request is made.
+        self.pages: dict[str, dict[str, int]] = {}
+        collect = main.collect_item_metrics
+
+        def fake_collect(link: str) -> dict[str, int]:
+            if link in self.pages:
+                return self.pages[link]
+            return collect(link)
+
+        patcher = mock.patch.object(main, "collect_item_metrics", side_effect=fake_collect)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def close_pool(self) -> None:
+        while not db._pool._idle.empty():
+            db._pool._idle.get_nowait().close()
+
+    def add_item(self, link: str, creator_name: str | None = None, metrics: dict[str, int] | None = None) -> int:
+        if metrics is not None:
+            self.pages[link] = metrics
+        with db.get_connection() as conn:
+            return conn.execute(
+                "INSERT INTO items (source_id, title, link, fingerprint, creator_name) VALUES (1, 'title', ?, ?, ?)",
+                (link, link, creator_name),
+            ).lastrowid
+
+    def item(self, item_id: int):
+        with db.get_connection() as conn:
+            return conn.execute(
+                "SELECT status, metrics_status, total_character_count FROM items WHERE id = ?", (item_id,)
+            ).fetchone()
+
+    def test_item_ids_must_number_1_to_100(self) -> None:
+        for item_ids in ([], list(range(1, 102))):
+            with self.subTest(count=len(item_ids)), self.assertRaises(ValidationError):
+                MetricsBatchIn(item_ids=item_ids)
+        self.assertEqual(len(MetricsBatchIn(item_ids=list(range(1, 101))).item_ids), 100)
+
+    def test_reports_unknown_ids_and_non_note_links(self) -> None:
+        note_item = self.add_item("https://note.com/user/n/1", metrics=GOOD_METRICS)
+        other_item = self.add_item("https://example.com/1")
+
+        response = fetch_items_metrics(MetricsBatchIn(item_ids=[note_item, other_item, 999, note_item]))
+
+        self.assertEqual(
+            response["results"],
+            [
+                {"item_id": note_item, "status": "done", "metrics": GOOD_METRICS},
+                {"item_id": other_item, "status": "failed", "detail": "link is not note.com"},
+                {"item_id": 999, "status": "not_found"},
+            ],
+        )
+        self.assertEqual(self.item(note_item)["metrics_status"], "done")
+        self.assertEqual(self.item(note_item)["total_character_count"], 1000)
+        self.assertEqual(self.item(other_item)["metrics_status"], "failed")
+
+    def test_auto_blocks_author_of_flagged_item(self) -> None:
+        flagged = self.add_item("https://note.com/spam/n/1", "spam", SHORT_METRICS)
+        same_author = self.add_item("https://note.com/spam/n/2", "spam")
+        kept = self.add_item("https://note.com/good/n/1", "good", GOOD_METRICS)
+
+        fetch_items_metrics(MetricsBatchIn(item_ids=[flagged, kept]))
+
+        with db.get_connection() as conn:
+            rules = conn.execute("SELECT source_id, creator_name, rule_type FROM author_rules").fetchall()
+        self.assertEqual([tuple(rule) for rule in rules], [(1, "spam", "block")])
+        self.assertEqual(self.item(flagged)["status"], "ignored")
+        self.assertEqual(self.item(same_author)["status"], "ignored")
+        self.assertEqual(self.item(kept)["status"], "unread")
+
+
+if __name__ == "__main__":
+    unittest.main()
\ No newline at end of file
@@ -0,0 +1,66 @@
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(BACKEND_DIR))
+
+from app import db  # noqa: E402
+from app.main import SAVED_ITEMS_COUNT_SQL  # noqa: E402
+
+NO_FILTERS = {"source_id": None, "status": None, "tag": None, "fts_query": None, "title_like": None}
+
+
+class SavedDateFilterTest(unittest.TestCase):
+    def setUp(self) -> None:
+        tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp_dir.cleanup)
+        original_pool = db._pool
+        db._pool = db.ConnectionPool(Path(tmp_dir.name) / "rss_reader.db")
+        self.addCleanup(setattr, db, "_pool", original_pool)
+        self.addCleanup(self.close_pool)
+        db.init_db()
+        with db.get_connection() as conn:
+            conn.execute(
+                "INSERT INTO sources (site_name, feed_url, source_type) "
+                "VALUES ('note', 'https://note.com/user/rss', 'user')"
+            )
+            items = [
+                # 2024-01-01 in UTC, although the local (JST) day is 2024-01-02.
+                ("a", "2024-01-02T03:00:00+09:00", None),
+                ("b", "2024-01-02T12:00:00+09:00", None),
+                ("c", None, "2024-01-03"),
+                ("d", None, None),
+            ]
+            for fingerprint, published_at, published_date in items:
+                conn.execute(
+                    "INSERT INTO items (source_id, title, link, fingerprint, status, published_at, published_date) "
+                    "VALUES (1, 'title', 'https://note.com/user/n/x', ?, 'saved', ?, ?)",
+                    (fingerprint, published_at, published_date),
+                )
+
+    def close_pool(self) -> None:
+        while not db._pool._idle.empty():
+            db._pool._idle.get_nowait().close()
+
+    def count(self, date_from, date_to) -> int:
+        with db.get_connection() as conn:
+            params = {**NO_FILTERS, "date_from": date_from, "date_to": date_to}
+            return conn.execute(SAVED_ITEMS_COUNT_SQL, params).fetchone()[0]
+
+    def test_no_bounds_include_undated_items(self) -> None:
+        self.assertEqual(self.count(None, None), 4)
+
+    def test_bounds_compare_utc_days(self) -> None:
+        self.assertEqual(self.count("2024-01-01", "2024-01-01"), 1)
+        self.assertEqual(self.count("2024-01-02", None), 2)
+        self.assertEqual(self.count(None, "2024-01-02"), 2)
+
+    def test_malformed_bound_matches_nothing(self) -> None:
+        self.assertEqual(self.count("not-a-date", None), 0)
+        self.assertEqual(self.count(None, "2024-13-01"), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
\ No newline at end of file
@@ -0,0 +1,63 @@
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(BACKEND_DIR))
+
+from app import db, main  # noqa: E402
+
+
+class SiteNameCacheTest(unittest.TestCase):
+    def setUp(self) -> None:
+        tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp_dir.cleanup)
+        original_pool = db._pool
+        db._pool = db.ConnectionPool(Path(tmp_dir.name) / "rss_reader.db")
+        self.addCleanup(setattr, db, "_pool", original_pool)
+        self.addCleanup(self.close_pool)
+        db.init_db()
+        main.invalidate_site_names()
+        self.add_source(1, "first")
+
+    def close_pool(self) -> None:
+        while not db._pool._idle.empty():
+            db._pool._idle.get_nowait().close()
+
+    # Written straight to the database, as another worker process would, so the in-process
+    # invalidation never runs.
+    def add_source(self, source_id: int, site_name: str) -> None:
+        with db.get_connection() as conn:
+            conn.execute(
+                "INSERT INTO sources (id, site_name, feed_url, source_type) VALUES (?, ?, ?, 'user')",
+                (source_id, site_name, f"https://note.com/{source_id}/rss"),
+            )
+
+    def site_names(self, *source_ids: int) -> list[str]:
+        with db.get_connection() as conn:
+            items = main.fill_site_names(conn, [{"source_id": source_id} for source_id in source_ids])
+        return [item["site_name"] for item in items]
+
+    def test_unknown_source_reloads_cache(self) -> None:
+        self.assertEqual(self.site_names(1), ["first"])
+
+        self.add_source(2, "second")
+
+        self.assertEqual(self.site_names(1, 2), ["first", "second"])
+
+    def test_rename_is_seen_after_ttl(self) -> None:
+        with mock.patch.object(main.time, "monotonic", return_value=1000.0):
+            self.assertEqual(self.site_names(1), ["first"])
+        with db.get_connection() as conn:
+            conn.execute("UPDATE sources SET site_name = 'renamed' WHERE id = 1")
+
+        with mock.patch.object(main.time, "monotonic", return_value=1000.0 + main.CACHE_TTL_SEC - 1):
+            self.assertEqual(self.site_names(1), ["first"])
+        with mock.patch.object(main.time, "monotonic", return_value=1000.0 + main.CACHE_TTL_SEC):
+            self.assertEqual(self.site_names(1), ["renamed"])
+
+
+if __name__ == "__main__":
+    unittest.main()
\ No newline at end of file
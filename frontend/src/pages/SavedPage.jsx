@@ -309,6 +309,7 @@ export default function SavedPage() {
           actionLabel="編集"
           onClose={() => setEditItem(null)}
           onSubmit={handleEdit}
+          defaultValue={(editItem.tags || []).join(", ")}
         />
       )}
     </section>